@@ -1,10 +1,13 @@
 """AWS client factory functions for lokki."""
 
 import os
+import threading
+from functools import lru_cache
 from typing import Literal
 
 import boto3
 from botocore.client import BaseClient
+from botocore.config import Config
 
 AWS_SERVICE = Literal[
     "s3",
@@ -18,10 +21,40 @@ AWS_SERVICE = Literal[
 ]
 
 
+# FilterLogEvents has a low TPS quota and is called from a thread pool, so let
+# the client back off adaptively when it gets throttled
+_LOGS_CLIENT_CONFIG = Config(retries={"mode": "adaptive", "max_attempts": 10})
+
+# Handlers read and write map items from a thread pool through one S3 client;
+# size its connection pool to match instead of botocore's default of 10
+_S3_CLIENT_CONFIG = Config(max_pool_connections=32)
+
+# boto3 sessions are not thread-safe; client creation from them is serialized
+_session_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _get_session(region: str) -> boto3.session.Session:
+    """Get the shared boto3 session for a region.
+
+    A session parses the AWS config files and loads endpoint and service
+    model data once, so clients created from it are much cheaper than
+    clients created from scratch.
+
+    Args:
+        region: AWS region.
+
+    Returns:
+        boto3.session.Session: Session bound to the region.
+    """
+    return boto3.session.Session(region_name=region)
+
+
 def _get_aws_client(
     service: AWS_SERVICE,
     region: str = "us-east-1",
     endpoint: str | None = None,
+    config: Config | None = None,
 ) -> BaseClient:
     """Create an AWS client for the specified service.
 
@@ -29,26 +62,32 @@ def _get_aws_client(
         service: AWS service name (e.g., "s3", "stepfunctions").
         region: AWS region (default: "us-east-1").
         endpoint: Optional endpoint URL (overrides AWS_ENDPOINT_URL env var).
+        config: Optional botocore client configuration.
 
     Returns:
         botocore.client.BaseClient: Configured AWS client for the service.
     """
-    kwargs: dict[str, str] = {"region_name": region}
+    kwargs: dict[str, str] = {}
     if endpoint or (endpoint := os.environ.get("AWS_ENDPOINT_URL")):
         kwargs["endpoint_url"] = endpoint
-    return boto3.client(service, **kwargs)
+    session = _get_session(region)
+    with _session_lock:
+        return session.client(service, config=config, **kwargs)
 
 
-def get_s3_client(endpoint: str | None = None) -> BaseClient:
+def get_s3_client(endpoint: str | None = None, region: str = "us-east-1") -> BaseClient:
     """Get S3 client with endpoint from AWS_ENDPOINT_URL env var.
 
     Args:
         endpoint: Optional endpoint URL (overrides AWS_ENDPOINT_URL env var).
+        region: AWS region (default: "us-east-1").
 
     Returns:
         botocore.client.BaseClient: Configured S3 client.
     """
-    return _get_aws_client("s3", endpoint=endpoint)
+    return _get_aws_client(
+        "s3", region=region, endpoint=endpoint, config=_S3_CLIENT_CONFIG
+    )
 
 
 def get_sfn_client(
@@ -91,7 +130,9 @@ def get_logs_client(
     Returns:
         botocore.client.BaseClient: Configured CloudWatch Logs client.
     """
-    return _get_aws_client("logs", region=region, endpoint=endpoint)
+    return _get_aws_client(
+        "logs", region=region, endpoint=endpoint, config=_LOGS_CLIENT_CONFIG
+    )
 
 
 def get_ecr_client(
@@ -6,7 +6,6 @@ import logging
 import time
 from collections.abc import Callable, Generator
 from contextlib import contextmanager
-from datetime import datetime
 from functools import wraps
 from typing import TYPE_CHECKING, Any, TypeVar
 
@@ -50,10 +49,10 @@ def timed[T](func: Callable[..., T]) -> Callable[..., T]:
 
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> T:
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             logger = logging.getLogger(func.__module__)
             logger.debug(
                 f"Function '{func.__name__}' completed in {duration:.3f}s",
@@ -61,7 +60,7 @@ def timed[T](func: Callable[..., T]) -> Callable[..., T]:
             )
             return result
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             logger = logging.getLogger(func.__module__)
             logger.error(
                 f"Function '{func.__name__}' failed after {duration:.3f}s: {e}",
@@ -9,23 +9,208 @@ It handles:
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import os
 import shutil
+import socket
 import subprocess
-from datetime import datetime
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
+
+from botocore.client import BaseClient
+from botocore.exceptions import BotoCoreError, ClientError, WaiterError
 
 from lokki._aws import (
     get_cf_client,
     get_dynamodb_client,
     get_ecr_client,
+    get_s3_client,
     get_sts_client,
 )
 from lokki._errors import DeployError, DockerNotAvailableError
 
 logger = logging.getLogger(__name__)
 
+# Where ECR login expiry is recorded so repeated deploys can skip `docker login`
+ECR_LOGIN_CACHE_DIR = Path.home() / ".lokki" / "cache"
+
+# Re-login when the cached ECR token has less than this much validity left
+_ECR_LOGIN_MIN_VALIDITY = timedelta(minutes=5)
+
+# Seconds a docker command may go without printing anything before it is killed
+_IDLE_TIMEOUT = 300
+
+# Number of trailing output lines kept from docker commands for error messages
+_OUTPUT_TAIL_LINES = 200
+
+# Stack waiter polling: 15 s between checks, giving up after 30 minutes
+_STACK_WAITER_DELAY = 15
+_STACK_WAITER_MAX_ATTEMPTS = 120
+
+# Change sets are computed in seconds, so poll them more often than stacks
+_CHANGE_SET_WAITER_DELAY = 5
+
+# CloudFormation template parameters, in the order their values are passed
+_STACK_PARAMETER_KEYS = (
+    "FlowName",
+    "S3Bucket",
+    "ECRRepoPrefix",
+    "ImageTag",
+    "AWSEndpoint",
+)
+
+
+# Largest template CloudFormation accepts inline; larger ones go through S3
+_TEMPLATE_BODY_LIMIT = 51_200
+
+# Stack tag holding the digest of the template and parameters last deployed
+_STACK_DIGEST_TAG = "lokki:template-sha256"
+
+# File in the build directory recording the image URI and context hash of
+# the last successful push
+_PUSH_MARKER = ".last_pushed_digest"
+
+
+def _hash_directory(path: Path) -> str:
+    """Compute a content hash over all files below a directory.
+
+    Relative paths are included so renames change the hash. The tree is
+    walked with os.walk (scandir-based) so directory entries need no extra
+    stat calls; names are sorted at each level to keep the order stable.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        rel_dir = os.path.relpath(dirpath, path)
+        for name in sorted(filenames):
+            rel_path = name if rel_dir == "." else f"{rel_dir}/{name}"
+            digest.update(rel_path.replace(os.sep, "/").encode())
+            digest.update(b"\0")
+            with open(os.path.join(dirpath, name), "rb") as f:
+                digest.update(hashlib.file_digest(f, "blake2b").digest())
+    return digest.hexdigest()
+
+
+def _stack_parameters(values: tuple[str, ...]) -> list[dict[str, str]]:
+    """Build the CloudFormation Parameters list from values in key order."""
+    return [
+        {"ParameterKey": key, "ParameterValue": value}
+        for key, value in zip(_STACK_PARAMETER_KEYS, values, strict=True)
+    ]
+
+
+def _stack_digest(template_body: str, parameters: list[dict[str, str]]) -> str:
+    """Digest everything a stack update sends, to detect no-op updates."""
+    digest = hashlib.sha256(template_body.encode())
+    digest.update(json.dumps(parameters, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _run_streaming(
+    cmd: list[str],
+    cwd: Path | None = None,
+    idle_timeout: float = _IDLE_TIMEOUT,
+    env: dict[str, str] | None = None,
+) -> tuple[int, str]:
+    """Run a command while keeping only the tail of its output in memory.
+
+    Docker build/push logs can be very large, so stdout and stderr are merged
+    and consumed line by line instead of being buffered in full. The command
+    may run for as long as it keeps producing output; it is only killed once
+    it has been silent for ``idle_timeout`` seconds.
+
+    Args:
+        cmd: Command and arguments to execute.
+        cwd: Optional working directory.
+        idle_timeout: Seconds without any output before the command is killed.
+        env: Optional environment for the command (defaults to os.environ).
+
+    Returns:
+        Tuple of (return code, last lines of combined output).
+
+    Raises:
+        subprocess.TimeoutExpired: If the command stalls for too long.
+    """
+    tail: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+    last_output = time.monotonic()
+
+    def read(stream: IO[str]) -> None:
+        nonlocal last_output
+        for line in stream:
+            last_output = time.monotonic()
+            tail.append(line)
+            logger.debug(line.rstrip())
+
+    with subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as proc:
+        assert proc.stdout is not None
+        reader = threading.Thread(target=read, args=(proc.stdout,), daemon=True)
+        reader.start()
+        try:
+            while True:
+                try:
+                    proc.wait(timeout=min(idle_timeout, 1.0))
+                    break
+                except subprocess.TimeoutExpired:
+                    if time.monotonic() - last_output >= idle_timeout:
+                        proc.kill()
+                        raise subprocess.TimeoutExpired(cmd, idle_timeout) from None
+        finally:
+            reader.join()
+    return proc.returncode, "".join(tail)
+
+
+def _ping_docker_socket() -> bool:
+    """Check the Docker daemon with a ``GET /_ping`` on its UNIX socket.
+
+    Much cheaper than ``docker info``. Returns False whenever the answer is
+    not a definite yes (TCP or context-selected daemons, no socket, odd
+    replies) so callers can fall back to the CLI for a proper diagnosis.
+    """
+    if os.environ.get("DOCKER_CONTEXT") or not hasattr(socket, "AF_UNIX"):
+        return False
+    host = os.environ.get("DOCKER_HOST", "unix:///var/run/docker.sock")
+    if not host.startswith("unix://"):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(2)
+            sock.connect(host.removeprefix("unix://"))
+            sock.sendall(b"GET /_ping HTTP/1.1\r\nHost: docker\r\n\r\n")
+            status_line = sock.recv(64).split(b"\r\n", 1)[0]
+    except OSError:
+        return False
+    return status_line.startswith(b"HTTP/1.") and status_line[9:12] == b"200"
+
+
+def _write_ecr_login_cache(path: Path, registry: str, expires_at: datetime) -> None:
+    """Record a successful ECR login; failures only cost a re-login later."""
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=UTC)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"registry": registry, "expiresAt": expires_at.isoformat()}, f)
+    except OSError as e:
+        logger.debug("Could not write ECR login cache %s: %s", path, e)
+
 
 class Deployer:
     """Deploys lokki flows to AWS.
@@ -55,17 +240,55 @@ class Deployer:
         self.endpoint = endpoint
         self.package_type = package_type
 
-        self.cf_client = get_cf_client(region)
-        self.ecr_client = get_ecr_client(region)
-        self.sts_client = get_sts_client(region)
-        self.dynamodb_client = get_dynamodb_client(region, endpoint)
-        self._account_id: str | None = None
+    # Clients are created on first use: building one loads the service model,
+    # and e.g. ZIP deployments never touch ECR.
+    @cached_property
+    def cf_client(self) -> BaseClient:
+        return get_cf_client(self.region)
+
+    @cached_property
+    def ecr_client(self) -> BaseClient:
+        return get_ecr_client(self.region)
+
+    @cached_property
+    def s3_client(self) -> BaseClient:
+        return get_s3_client(self.endpoint, region=self.region)
+
+    @cached_property
+    def sts_client(self) -> BaseClient:
+        return get_sts_client(self.region)
+
+    @cached_property
+    def dynamodb_client(self) -> BaseClient:
+        return get_dynamodb_client(self.region, self.endpoint)
 
-    @property
+    @cached_property
     def account_id(self) -> str:
-        if self._account_id is None:
-            self._account_id = str(self.sts_client.get_caller_identity()["Account"])
-        return self._account_id
+        return str(self.sts_client.get_caller_identity()["Account"])
+
+    @cached_property
+    def _buildx_available(self) -> bool:
+        """Whether ``docker buildx`` can export layer cache to a registry.
+
+        The default ``docker`` driver cannot export cache, so a
+        docker-container (or other) builder has to be selected.
+        """
+        try:
+            result = subprocess.run(
+                ["docker", "buildx", "inspect"],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return False
+        if result.returncode != 0:
+            return False
+        for line in result.stdout.splitlines():
+            key, _, value = line.partition(":")
+            if key.strip() == "Driver":
+                return value.strip() != "docker"
+        return False
 
     def deploy(
         self,
@@ -77,24 +300,34 @@ class Deployer:
         package_type: str = "image",
     ) -> None:
         self._validate_credentials()
-        if package_type == "zip":
-            print("Uploading Lambda ZIP to S3...")
-            self._upload_lambda_zip(flow_name, artifact_bucket, build_dir)
-        else:
-            print("Pushing Docker images...")
-            self._push_images(image_repository, build_dir)
-        self._deploy_stack(
-            flow_name, artifact_bucket, image_repository, aws_endpoint, build_dir
-        )
+        # The stack lookup is independent of the artifact upload, so run it
+        # in the background while the (much slower) image build is going on.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            stack_lookup = executor.submit(self._describe_stack)
+            if package_type == "zip":
+                print("Uploading Lambda ZIP to S3...")
+                self._upload_lambda_zip(flow_name, artifact_bucket, build_dir)
+            else:
+                print("Pushing Docker images...")
+                self._push_images(image_repository, build_dir)
+            self._deploy_stack(
+                flow_name,
+                artifact_bucket,
+                image_repository,
+                aws_endpoint,
+                build_dir,
+                stack_lookup=stack_lookup,
+            )
 
     def _validate_credentials(self, require_ecr: bool = True) -> None:
         if self.endpoint:
             return
 
         try:
-            self.sts_client.get_caller_identity()
+            identity = self.sts_client.get_caller_identity()
         except Exception as e:
             raise DeployError(f"AWS credentials not configured: {e}") from e
+        self.account_id = str(identity["Account"])
 
         if not shutil.which("docker"):
             raise DockerNotAvailableError(
@@ -102,6 +335,9 @@ class Deployer:
                 "Please install Docker and try again."
             )
 
+        if _ping_docker_socket():
+            return
+
         try:
             result = subprocess.run(
                 ["docker", "info"],
@@ -131,23 +367,104 @@ class Deployer:
         if not dockerfile_path.exists():
             raise DeployError(f"Dockerfile not found: {dockerfile_path}")
 
+        image_name = "lokki"
         if image_repository == "registry:ci":
             registry_url = "localhost:5000"
-            image_name = "lokki"
             image_uri = f"{registry_url}/{image_name}:{self.image_tag}"
+        else:
+            image_uri = f"{image_repository}/{image_name}:{self.image_tag}"
+
+        # Skip the build and push entirely when the image context is
+        # byte-identical to the one last pushed under the same URI.
+        marker_path = build_dir / _PUSH_MARKER
+        fingerprint = _hash_directory(lambdas_dir)
+        push_key = f"{image_uri} {fingerprint}"
+        if marker_path.exists() and marker_path.read_text() == push_key:
+            print(f"Skipping build/push of {image_uri}: no changes since last push")
+            return
+
+        # An image built from the same context may already be in ECR, e.g.
+        # pushed from another machine or under another tag: retag it there.
+        if image_repository != "registry:ci":
+            _, _, prefix = image_repository.partition("/")
+            repository_name = f"{prefix}/{image_name}" if prefix else image_name
+            content_tag = f"ctx-{fingerprint}"
+            if self._tag_ecr_image(repository_name, content_tag, self.image_tag):
+                print(f"Reusing existing image for {image_uri}: context unchanged")
+                marker_path.write_text(push_key)
+                return
+
+        if image_repository == "registry:ci":
             print(f"Building Docker image: {image_uri}...")
             self._build_image(lambdas_dir, image_uri)
             print(f"Pushing to local registry: {image_uri}...")
             self._push_image(image_uri)
-            print(f"Successfully pushed image: {image_uri}")
         else:
-            self._login_to_ecr()
-            image_name = "lokki"
-            image_uri = f"{image_repository}/{image_name}:{self.image_tag}"
             print(f"Building and pushing shared Docker image: {image_uri}...")
-            self._build_image(lambdas_dir, image_uri)
+            # Log in first: the build reads its layer cache from the registry
+            registry_host = image_repository.split("/", 1)[0]
+            cache_ref = f"{image_repository}/{image_name}:buildcache"
+            login_reused = self._login_to_ecr(registry_host)
+            try:
+                self._build_and_push_to_ecr(lambdas_dir, image_uri, cache_ref)
+            except DockerNotAvailableError:
+                raise
+            except DeployError:
+                if not login_reused:
+                    raise
+                # The cached expiry cannot tell whether docker still holds the
+                # credential (logout, another DOCKER_CONFIG); log in for real
+                logger.info(f"Push to {registry_host} failed, logging in again")
+                self._login_to_ecr(registry_host, use_cache=False)
+                self._build_and_push_to_ecr(lambdas_dir, image_uri, cache_ref)
+            self._tag_ecr_image(repository_name, self.image_tag, content_tag)
+        print(f"Successfully pushed image: {image_uri}")
+        marker_path.write_text(push_key)
+
+    def _build_and_push_to_ecr(
+        self, context: Path, image_uri: str, cache_ref: str
+    ) -> None:
+        if self._buildx_available:
+            self._buildx_build_and_push(context, image_uri, cache_ref)
+        else:
+            self._build_image(context, image_uri)
             self._push_image(image_uri)
-            print(f"Successfully pushed image: {image_uri}")
+
+    def _tag_ecr_image(self, repository_name: str, source_tag: str, tag: str) -> bool:
+        """Add ``tag`` to the ECR image tagged ``source_tag``, server-side.
+
+        Returns:
+            True if the tag now points at the image, False if the source image
+            does not exist or the registry could not be reached or queried.
+        """
+        try:
+            response = self.ecr_client.batch_get_image(
+                repositoryName=repository_name,
+                imageIds=[{"imageTag": source_tag}],
+            )
+            images = response.get("images") or []
+            if not images:
+                return False
+            image = images[0]
+            kwargs: dict[str, str] = {
+                "repositoryName": repository_name,
+                "imageManifest": image["imageManifest"],
+                "imageTag": tag,
+            }
+            if media_type := image.get("imageManifestMediaType"):
+                kwargs["imageManifestMediaType"] = media_type
+            self.ecr_client.put_image(**kwargs)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code == "ImageAlreadyExistsException":
+                return True
+            logger.debug(f"Could not tag {repository_name}:{tag}: {e}")
+            return False
+        except BotoCoreError as e:
+            # Connection or credential problems; callers fall back to a push
+            logger.debug(f"Could not tag {repository_name}:{tag}: {e}")
+            return False
+        return True
 
     def _upload_lambda_zip(self, flow_name: str, bucket: str, build_dir: Path) -> None:
         from lokki.builder.s3 import upload_lambda_zip
@@ -159,7 +476,36 @@ class Deployer:
         zip_data = zip_path.read_bytes()
         upload_lambda_zip(flow_name, zip_data, bucket)
 
-    def _login_to_ecr(self) -> None:
+    def _login_to_ecr(self, registry_host: str, use_cache: bool = True) -> bool:
+        """Log docker in to ECR unless a previous login is still valid.
+
+        Docker keeps the credential from the last ``docker login`` in its own
+        config, so only the token expiry is cached (never the token itself),
+        keyed by the registry host which encodes both account and region.
+
+        Args:
+            registry_host: ECR registry host, e.g.
+                ``123456789012.dkr.ecr.eu-west-1.amazonaws.com``.
+            use_cache: If False, discard any cached login and log in again.
+
+        Returns:
+            True if the login was skipped because of a cached login.
+        """
+        cache_path = ECR_LOGIN_CACHE_DIR / f"ecr-{registry_host}.json"
+        if not use_cache:
+            try:
+                cache_path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug("Could not remove ECR login cache %s: %s", cache_path, e)
+        try:
+            cached = json.loads(cache_path.read_text())
+            expires_at = datetime.fromisoformat(cached["expiresAt"])
+            if expires_at - datetime.now(UTC) > _ECR_LOGIN_MIN_VALIDITY:
+                logger.debug("Reusing ECR login for %s", registry_host)
+                return True
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
         try:
             token = self.ecr_client.get_authorization_token()
             auth_data = token["authorizationData"][0]
@@ -187,34 +533,81 @@ class Deployer:
         except Exception as e:
             raise DeployError(f"Failed to login to ECR: {e}") from e
 
+        expires_at = auth_data.get("expiresAt")
+        if isinstance(expires_at, datetime):
+            _write_ecr_login_cache(cache_path, registry, expires_at)
+        return False
+
     def _build_image(self, context: Path, image_uri: str) -> None:
+        # BuildKit reads the inline cache of --cache-from straight from the
+        # registry, fetching only the layers it reuses; no pull is needed.
         try:
-            build_result = subprocess.run(
-                ["docker", "build", "-t", image_uri, "."],
+            returncode, output = _run_streaming(
+                [
+                    "docker",
+                    "build",
+                    "--build-arg",
+                    "BUILDKIT_INLINE_CACHE=1",
+                    "--cache-from",
+                    image_uri,
+                    "-t",
+                    image_uri,
+                    ".",
+                ],
                 cwd=context,
-                capture_output=True,
-                text=True,
-                timeout=600,
+                env={**os.environ, "DOCKER_BUILDKIT": "1"},
             )
-            if build_result.returncode != 0:
-                raise DeployError(f"Docker build failed: {build_result.stderr}")
+            if returncode != 0:
+                raise DeployError(f"Docker build failed: {output}")
         except subprocess.TimeoutExpired:
             raise DeployError(f"Docker build timed out for {context.name}") from None
         except FileNotFoundError:
             raise DockerNotAvailableError("Docker is not installed") from None
 
-    def _push_image(self, image_uri: str) -> None:
+    def _buildx_build_and_push(
+        self, context: Path, image_uri: str, cache_ref: str
+    ) -> None:
+        """Build and push in one pass, sharing layer cache through the registry.
+
+        The cache manifest lives under a single ``buildcache`` tag that is
+        overwritten on every push. Provenance attestations are disabled
+        because Lambda rejects image indexes.
+        """
         try:
-            push_result = subprocess.run(
-                ["docker", "push", image_uri],
-                capture_output=True,
-                text=True,
-                timeout=600,
+            returncode, output = _run_streaming(
+                [
+                    "docker",
+                    "buildx",
+                    "build",
+                    "--push",
+                    "--provenance=false",
+                    "--cache-from",
+                    f"type=registry,ref={cache_ref}",
+                    "--cache-to",
+                    f"type=registry,ref={cache_ref},mode=max,"
+                    "image-manifest=true,oci-mediatypes=true",
+                    "-t",
+                    image_uri,
+                    ".",
+                ],
+                cwd=context,
             )
-            if push_result.returncode != 0:
-                raise DeployError(f"Docker push failed: {push_result.stderr}")
+            if returncode != 0:
+                raise DeployError(f"Docker build failed: {output}")
+        except subprocess.TimeoutExpired:
+            raise DeployError(f"Docker build timed out for {context.name}") from None
+        except FileNotFoundError:
+            raise DockerNotAvailableError("Docker is not installed") from None
+
+    def _push_image(self, image_uri: str) -> None:
+        try:
+            returncode, output = _run_streaming(["docker", "push", image_uri])
+            if returncode != 0:
+                raise DeployError(f"Docker push failed: {output}")
         except subprocess.TimeoutExpired:
             raise DeployError(f"Docker push timed out for {image_uri}") from None
+        except FileNotFoundError:
+            raise DockerNotAvailableError("Docker is not installed") from None
 
     def _deploy_stack(
         self,
@@ -223,6 +616,7 @@ class Deployer:
         image_repository: str,
         aws_endpoint: str = "",
         build_dir: Path | None = None,
+        stack_lookup: Future[dict[str, Any] | None] | None = None,
     ) -> None:
         if build_dir is None:
             build_dir = Path("lokki-build")
@@ -240,9 +634,28 @@ class Deployer:
             raise DeployError(f"Failed to read template: {e}") from e
 
         self._deploy_with_boto3(
-            template_body, flow_name, artifact_bucket, image_repository, aws_endpoint
+            template_body,
+            flow_name,
+            artifact_bucket,
+            image_repository,
+            aws_endpoint,
+            stack_lookup=stack_lookup,
         )
 
+    def _describe_stack(self) -> dict[str, Any] | None:
+        """Return the existing stack description, or None if it does not exist."""
+        try:
+            stack: dict[str, Any] = self.cf_client.describe_stacks(
+                StackName=self.stack_name
+            )["Stacks"][0]
+            return stack
+        except self.cf_client.exceptions.StackNotFoundException:
+            return None
+        except self.cf_client.exceptions.ClientError as e:
+            if "does not exist" in str(e):
+                return None
+            raise
+
     def _deploy_with_boto3(
         self,
         template_body: str,
@@ -250,88 +663,70 @@ class Deployer:
         artifact_bucket: str,
         image_repository: str,
         aws_endpoint: str,
+        stack_lookup: Future[dict[str, Any] | None] | None = None,
     ) -> None:
         if image_repository == "registry:ci":
             ecr_repo_prefix = "localhost:5000"
         else:
             ecr_repo_prefix = image_repository
 
+        parameters = _stack_parameters(
+            (flow_name, artifact_bucket, ecr_repo_prefix, self.image_tag, aws_endpoint)
+        )
+
+        digest = _stack_digest(template_body, parameters)
+
         try:
-            existing_stack = None
-            try:
-                existing_stack = self.cf_client.describe_stacks(
-                    StackName=self.stack_name
-                )["Stacks"][0]
-            except self.cf_client.exceptions.StackNotFoundException:
-                pass
-            except self.cf_client.exceptions.ClientError as e:
-                if "does not exist" in str(e):
-                    pass
-                else:
-                    raise
+            if stack_lookup is not None:
+                existing_stack = stack_lookup.result()
+            else:
+                existing_stack = self._describe_stack()
 
             if existing_stack:
+                existing_tags = {
+                    t["Key"]: t["Value"] for t in existing_stack.get("Tags") or []
+                }
+                status = existing_stack["StackStatus"]
+                if existing_tags.get(_STACK_DIGEST_TAG) == digest and status in (
+                    "CREATE_COMPLETE",
+                    "UPDATE_COMPLETE",
+                ):
+                    print(f"Stack '{self.stack_name}' is up to date")
+                    self._register_flow_metadata(
+                        flow_name, self._get_stack_outputs(existing_stack)
+                    )
+                    return
+
+                # Tags replace the full set on update, so keep any others
+                existing_tags[_STACK_DIGEST_TAG] = digest
+                change_set = self._create_change_set(
+                    self._template_source(template_body, artifact_bucket),
+                    parameters,
+                    [{"Key": k, "Value": v} for k, v in existing_tags.items()],
+                )
+                if change_set is None:
+                    print(f"Stack '{self.stack_name}' is up to date")
+                    self._register_flow_metadata(
+                        flow_name, self._get_stack_outputs(existing_stack)
+                    )
+                    return
+
                 print(f"Updating stack '{self.stack_name}'...")
-                self.cf_client.update_stack(
-                    StackName=self.stack_name,
-                    TemplateBody=template_body,
-                    Capabilities=["CAPABILITY_IAM"],
-                    Parameters=[
-                        {
-                            "ParameterKey": "FlowName",
-                            "ParameterValue": flow_name,
-                        },
-                        {
-                            "ParameterKey": "S3Bucket",
-                            "ParameterValue": artifact_bucket,
-                        },
-                        {
-                            "ParameterKey": "ECRRepoPrefix",
-                            "ParameterValue": ecr_repo_prefix,
-                        },
-                        {
-                            "ParameterKey": "ImageTag",
-                            "ParameterValue": self.image_tag,
-                        },
-                        {
-                            "ParameterKey": "AWSEndpoint",
-                            "ParameterValue": aws_endpoint,
-                        },
-                    ],
+                self.cf_client.execute_change_set(
+                    ChangeSetName=change_set, StackName=self.stack_name
                 )
             else:
                 print(f"Creating stack '{self.stack_name}'...")
                 self.cf_client.create_stack(
                     StackName=self.stack_name,
-                    TemplateBody=template_body,
                     Capabilities=["CAPABILITY_IAM"],
-                    Parameters=[
-                        {
-                            "ParameterKey": "FlowName",
-                            "ParameterValue": flow_name,
-                        },
-                        {
-                            "ParameterKey": "S3Bucket",
-                            "ParameterValue": artifact_bucket,
-                        },
-                        {
-                            "ParameterKey": "ECRRepoPrefix",
-                            "ParameterValue": ecr_repo_prefix,
-                        },
-                        {
-                            "ParameterKey": "ImageTag",
-                            "ParameterValue": self.image_tag,
-                        },
-                        {
-                            "ParameterKey": "AWSEndpoint",
-                            "ParameterValue": aws_endpoint,
-                        },
-                    ],
+                    Parameters=parameters,
+                    Tags=[{"Key": _STACK_DIGEST_TAG, "Value": digest}],
+                    **self._template_source(template_body, artifact_bucket),
                 )
 
-            self._wait_for_stack()
-
-            outputs = self._get_stack_outputs()
+            stack = self._wait_for_stack(is_update=bool(existing_stack))
+            outputs = self._get_stack_outputs(stack)
 
             self._register_flow_metadata(flow_name, outputs)
 
@@ -343,34 +738,133 @@ class Deployer:
         except self.cf_client.exceptions.AlreadyExistsException:
             print(f"Stack '{self.stack_name}' already exists")
             # Still register metadata
-            outputs = self._get_stack_outputs()
+            outputs = self._get_stack_outputs(self._describe_stack())
             self._register_flow_metadata(flow_name, outputs)
         except self.cf_client.exceptions.ClientError as e:
-            error_message = str(e)
-            if "No updates" in error_message:
-                print(f"Stack '{self.stack_name}' is up to date")
-                # Still register metadata
-                outputs = self._get_stack_outputs()
-                self._register_flow_metadata(flow_name, outputs)
-            else:
-                raise DeployError(f"CloudFormation error: {error_message}") from e
+            raise DeployError(f"CloudFormation error: {e}") from e
+
+    def _template_source(self, template_body: str, bucket: str) -> dict[str, str]:
+        """Return the TemplateBody or TemplateURL argument for a stack call.
+
+        Templates over the inline size limit are uploaded to the artifact
+        bucket under a content-addressed key, once per distinct template.
+        """
+        body = template_body.encode()
+        if len(body) <= _TEMPLATE_BODY_LIMIT:
+            return {"TemplateBody": template_body}
+
+        key = f"lokki/templates/{hashlib.sha256(body).hexdigest()}.yaml"
+        try:
+            self.s3_client.head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                raise DeployError(f"Failed to check template upload: {e}") from e
+            self.s3_client.put_object(Bucket=bucket, Key=key, Body=body)
+
+        if self.endpoint:
+            return {"TemplateURL": f"{self.endpoint.rstrip('/')}/{bucket}/{key}"}
+        return {"TemplateURL": f"https://{bucket}.s3.{self.region}.amazonaws.com/{key}"}
+
+    def _create_change_set(
+        self,
+        template: dict[str, str],
+        parameters: list[dict[str, str]],
+        tags: list[dict[str, str]],
+    ) -> str | None:
+        """Create an update change set for the stack and print its changes.
+
+        Args:
+            template: TemplateBody or TemplateURL argument for the stack.
+            parameters: Stack parameters.
+            tags: Stack tags.
+
+        Returns:
+            The change set name, or None if the update contains no changes
+            (the empty change set is deleted).
+        """
+        name = f"lokki-{uuid.uuid4().hex[:8]}"
+        self.cf_client.create_change_set(
+            StackName=self.stack_name,
+            ChangeSetName=name,
+            ChangeSetType="UPDATE",
+            Capabilities=["CAPABILITY_IAM"],
+            Parameters=parameters,
+            Tags=tags,
+            **template,
+        )
+        try:
+            self.cf_client.get_waiter("change_set_create_complete").wait(
+                StackName=self.stack_name,
+                ChangeSetName=name,
+                WaiterConfig={
+                    "Delay": _CHANGE_SET_WAITER_DELAY,
+                    "MaxAttempts": _STACK_WAITER_MAX_ATTEMPTS,
+                },
+            )
+        except WaiterError as e:
+            change_set = e.last_response or {}
+            reason = change_set.get("StatusReason", "")
+            if change_set.get("Status") == "FAILED" and (
+                "didn't contain changes" in reason or "No updates" in reason
+            ):
+                self.cf_client.delete_change_set(
+                    StackName=self.stack_name, ChangeSetName=name
+                )
+                return None
+            raise DeployError(f"Change set failed: {reason or e}") from e
+
+        changes = (
+            self.cf_client.describe_change_set(
+                StackName=self.stack_name, ChangeSetName=name
+            ).get("Changes")
+            or []
+        )
+        for change in changes:
+            resource = change.get("ResourceChange") or {}
+            print(
+                f"  {resource.get('Action', '?')} {resource.get('LogicalResourceId')}"
+                f" ({resource.get('ResourceType')})"
+            )
+        return name
 
-    def _wait_for_stack(self) -> None:
+    def _wait_for_stack(self, is_update: bool = False) -> dict[str, Any]:
+        """Wait for the stack operation to finish and return the final stack.
+
+        Args:
+            is_update: Wait for an update instead of a create operation.
+        """
         print("Waiting for stack operation to complete...")
 
-        while True:
+        waiter_name = "stack_update_complete" if is_update else "stack_create_complete"
+        try:
+            self.cf_client.get_waiter(waiter_name).wait(
+                StackName=self.stack_name,
+                WaiterConfig={
+                    "Delay": _STACK_WAITER_DELAY,
+                    "MaxAttempts": _STACK_WAITER_MAX_ATTEMPTS,
+                },
+            )
+        except WaiterError as e:
+            stacks = (e.last_response or {}).get("Stacks") or []
+            if not stacks:
+                raise DeployError(f"Stack operation failed: {e}") from e
+            stack: dict[str, Any] = stacks[0]
+        else:
             stack = self.cf_client.describe_stacks(StackName=self.stack_name)["Stacks"][
                 0
             ]
-            status = stack["StackStatus"]
 
-            if status == "CREATE_COMPLETE" or status == "UPDATE_COMPLETE":
-                return
-            elif "FAILED" in status or "ROLLBACK" in status:
-                reason = stack.get("StackStatusReason", "")
-                if not reason:
-                    reason = self._get_failure_reason()
-                raise DeployError(f"Stack {status}: {reason}")
+        status = stack["StackStatus"]
+        if status == "CREATE_COMPLETE" or status == "UPDATE_COMPLETE":
+            return stack
+        if status.endswith("_IN_PROGRESS"):
+            raise DeployError(
+                f"Timed out waiting for stack '{self.stack_name}' (status: {status})"
+            )
+        reason = stack.get("StackStatusReason", "")
+        if not reason:
+            reason = self._get_failure_reason()
+        raise DeployError(f"Stack {status}: {reason}")
 
     def _get_failure_reason(self) -> str:
         try:
@@ -385,9 +879,12 @@ class Deployer:
             pass
         return "Unknown error"
 
-    def _get_stack_outputs(self) -> list[dict[str, Any]]:
-        stack = self.cf_client.describe_stacks(StackName=self.stack_name)["Stacks"][0]
-        outputs: list[dict[str, Any]] = stack.get("Outputs", []) or []
+    @staticmethod
+    def _get_stack_outputs(stack: dict[str, Any] | None) -> list[dict[str, Any]]:
+        """Return a described stack's outputs (the key is absent if none)."""
+        if stack is None:
+            return []
+        outputs: list[dict[str, Any]] = stack.get("Outputs") or []
         return outputs
 
     def _register_flow_metadata(
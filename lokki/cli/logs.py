@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
 import sys
 import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from itertools import batched
 from typing import Any
 
 from botocore.exceptions import ClientError
@@ -15,6 +21,15 @@ from lokki._errors import LogsError
 
 logger = logging.getLogger(__name__)
 
+# FilterLogEvents is limited to 5 transactions per second per account
+_MAX_FETCH_WORKERS = 5
+
+# Seconds between tail polls
+_TAIL_INTERVAL = 2.0
+
+# Formatted log lines per stdout write
+_WRITE_BATCH_SIZE = 1000
+
 
 def fetch_logs(
     flow_name: str,
@@ -43,7 +58,7 @@ def fetch_logs(
     if end_time is None:
         end_time = datetime.now(UTC)
 
-    logs_client = get_logs_client(region)
+    logs_client = get_logs_client(region, endpoint)
 
     try:
         _fetch_and_print_logs(
@@ -93,24 +108,67 @@ def _print_logs(
     run_id: str | None,
 ) -> None:
     """Print logs for a time range."""
-    all_events: list[dict[str, Any]] = []
+    if not step_names:
+        print("No log events found.")
+        return
 
-    for step_name in step_names:
-        log_group = f"/aws/lambda/{flow_name}-{step_name}"
+    log_groups = [f"/aws/lambda/{flow_name}-{step_name}" for step_name in step_names]
+
+    def fetch_sorted(log_group: str) -> list[dict[str, Any]]:
         events = _fetch_log_events(logs_client, log_group, start_time, end_time, run_id)
-        all_events.extend(events)
+        return sorted(events, key=_event_sort_key)
+
+    # Each group is a separate HTTPS round trip; overlap them, staying within
+    # the FilterLogEvents TPS quota
+    with ThreadPoolExecutor(
+        max_workers=min(len(log_groups), _MAX_FETCH_WORKERS)
+    ) as executor:
+        events_by_group = list(executor.map(fetch_sorted, log_groups))
 
-    if not all_events:
+    if not any(events_by_group):
         print("No log events found.")
         return
 
-    all_events.sort(key=lambda e: (e["timestamp"], e["logStreamName"]))
+    prefixes: dict[str, str] = {}
 
-    for event in all_events:
-        timestamp = datetime.fromtimestamp(event["timestamp"] / 1000, tz=UTC)
-        step = event["logStreamName"].replace(f"{flow_name}-", "")
+    def format_event(event: dict[str, Any]) -> str:
+        stream = event["logStreamName"]
+        prefix = prefixes.get(stream)
+        if prefix is None:
+            prefix = prefixes[stream] = f"[{stream.replace(f'{flow_name}-', '')}]"
         message = event["message"].strip()
-        print(f"{timestamp.isoformat()} [{step}] {message}")
+        return f"{_format_timestamp(event['timestamp'])} {prefix} {message}"
+
+    merged = heapq.merge(*events_by_group, key=_event_sort_key)
+    _write_lines(map(format_event, merged))
+
+
+def _format_timestamp(timestamp_ms: int) -> str:
+    """Format an epoch-millisecond timestamp as ISO 8601 UTC."""
+    seconds, millis = divmod(timestamp_ms, 1000)
+    date_time = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+    return f"{date_time}.{millis:03d}+00:00"
+
+
+def _write_lines(lines: Iterable[str]) -> None:
+    """Write lines to stdout in batches rather than one write per line."""
+    for chunk in batched(lines, _WRITE_BATCH_SIZE, strict=False):
+        sys.stdout.write("\n".join(chunk) + "\n")
+
+
+def _run_id_filter_pattern(run_id: str) -> str:
+    """Build a CloudWatch filter pattern matching the run ID as an exact term.
+
+    The ID is quoted so characters such as ``-`` and ``:`` are matched
+    literally, with embedded quotes and backslashes escaped.
+    """
+    escaped = run_id.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _event_sort_key(event: dict[str, Any]) -> tuple[int, str]:
+    """Order log events by timestamp, then by stream name."""
+    return event["timestamp"], event["logStreamName"]
 
 
 def _fetch_log_events(
@@ -119,28 +177,40 @@ def _fetch_log_events(
     start_time: datetime,
     end_time: datetime,
     run_id: str | None,
-) -> list[dict[str, Any]]:
-    """Fetch log events from a log group."""
+) -> Iterator[dict[str, Any]]:
+    """Fetch log events from a log group.
+
+    Follows every page of the result, including empty pages that still
+    carry a ``nextToken``, and yields the events as they arrive.
+    """
+    kwargs: dict[str, Any] = {
+        "logGroupName": log_group,
+        "startTime": int(start_time.timestamp() * 1000),
+        "endTime": int(end_time.timestamp() * 1000),
+    }
+    if run_id:
+        kwargs["filterPattern"] = _run_id_filter_pattern(run_id)
+
+    paginator = logs_client.get_paginator("filter_log_events")
     try:
-        filter_pattern = f'"{run_id}"' if run_id else None
+        for page in paginator.paginate(**kwargs):
+            yield from page.get("events", [])
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ResourceNotFoundException":
+            raise
 
-        kwargs: dict[str, Any] = {
-            "logGroupName": log_group,
-            "startTime": int(start_time.timestamp() * 1000),
-            "endTime": int(end_time.timestamp() * 1000),
-            "limit": 10000,
-        }
-        if filter_pattern:
-            kwargs["filterPattern"] = filter_pattern
 
-        response = logs_client.filter_log_events(**kwargs)
-        events: list[dict[str, Any]] = response.get("events", [])
-        return events
+@dataclass(slots=True)
+class _TailCursor:
+    """Position of the tail in a single log group.
 
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceNotFoundException":
-            return []
-        raise
+    ``start_time`` is the newest event timestamp seen so far and
+    ``seen_ids`` holds the IDs of the events already printed at exactly
+    that timestamp, so the next poll can start there without repeats.
+    """
+
+    start_time: int
+    seen_ids: set[str] = field(default_factory=set)
 
 
 def _tail_logs(
@@ -152,55 +222,91 @@ def _tail_logs(
     """Tail logs in real-time."""
     print("Tailing logs... (Ctrl+C to stop)")
 
-    last_timestamps: dict[str, int] = {}
-
-    while True:
-        for step_name in step_names:
-            log_group = f"/aws/lambda/{flow_name}-{step_name}"
-            events = _tail_log_events(logs_client, log_group, run_id, last_timestamps)
-
-            for event in events:
-                timestamp = datetime.fromtimestamp(event["timestamp"] / 1000, tz=UTC)
-                message = event["message"].strip()
-                print(f"{timestamp.isoformat()} [{step_name}] {message}")
-
-                last_timestamps[log_group] = event["timestamp"]
-
-        time.sleep(2)
+    cursors: dict[str, _TailCursor] = {}
+    log_groups = [f"/aws/lambda/{flow_name}-{step_name}" for step_name in step_names]
+
+    def poll(log_group: str) -> list[dict[str, Any]]:
+        return _tail_log_events(logs_client, log_group, run_id, cursors)
+
+    # Poll every group concurrently so the interval does not grow with the
+    # number of steps; each worker only touches its own group's cursor
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(len(log_groups), _MAX_FETCH_WORKERS))
+    ) as executor:
+        while True:
+            deadline = time.monotonic() + _TAIL_INTERVAL
+            batch = [
+                (event, step_name)
+                for step_name, events in zip(
+                    step_names, executor.map(poll, log_groups), strict=True
+                )
+                for event in events
+            ]
+            batch.sort(key=lambda pair: _event_sort_key(pair[0]))
+
+            if batch:
+                _write_lines(
+                    f"{_format_timestamp(event['timestamp'])} [{step_name}] "
+                    f"{event['message'].strip()}"
+                    for event, step_name in batch
+                )
+                sys.stdout.flush()
+
+            time.sleep(max(0.0, deadline - time.monotonic()))
 
 
 def _tail_log_events(
     logs_client: Any,
     log_group: str,
     run_id: str | None,
-    last_timestamps: dict[str, int],
+    cursors: dict[str, _TailCursor],
 ) -> list[dict[str, Any]]:
-    """Fetch new log events since last check."""
-    try:
-        kwargs: dict[str, Any] = {
-            "logGroupName": log_group,
-            "limit": 100,
-            "startTime": int(
-                (datetime.now(UTC) - timedelta(seconds=5)).timestamp() * 1000
-            ),
-        }
-        if run_id:
-            kwargs["filterPattern"] = f'"{run_id}"'
-
-        response = logs_client.filter_log_events(**kwargs)
-        events = response.get("events", [])
-        result: list[dict[str, Any]] = events
-
-        if last_timestamps:
-            last_ts = last_timestamps.get(log_group, 0)
-            result = [e for e in result if e["timestamp"] > last_ts]
-
-        return result
+    """Fetch new log events since last check.
 
+    Starts from the newest timestamp seen in the group and drains every page
+    of the response. Events are deduplicated by ID rather than by a
+    timestamp cutoff, so late-arriving events that share the newest
+    timestamp are not dropped.
+    """
+    cursor = cursors.get(log_group)
+    if cursor is None:
+        start = datetime.now(UTC) - timedelta(seconds=5)
+        cursor = cursors[log_group] = _TailCursor(int(start.timestamp() * 1000))
+
+    kwargs: dict[str, Any] = {
+        "logGroupName": log_group,
+        "startTime": cursor.start_time,
+    }
+    if run_id:
+        kwargs["filterPattern"] = _run_id_filter_pattern(run_id)
+
+    event_ids_per_timestamp: defaultdict[int, set[str]] = defaultdict(set)
+    event_ids_per_timestamp[cursor.start_time] = cursor.seen_ids
+    result: list[dict[str, Any]] = []
+
+    try:
+        prev_token = None
+        while True:
+            response = logs_client.filter_log_events(**kwargs)
+            for event in response.get("events", []):
+                seen_ids = event_ids_per_timestamp[event["timestamp"]]
+                if event["eventId"] not in seen_ids:
+                    seen_ids.add(event["eventId"])
+                    result.append(event)
+
+            # The service occasionally hands back the same token twice
+            token = response.get("nextToken")
+            if not token or token == prev_token:
+                break
+            kwargs["nextToken"] = prev_token = token
     except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceNotFoundException":
-            return []
-        raise
+        if e.response["Error"]["Code"] != "ResourceNotFoundException":
+            raise
+
+    latest = max(event_ids_per_timestamp)
+    cursor.start_time = latest
+    cursor.seen_ids = event_ids_per_timestamp[latest]
+    return result
 
 
 def logs(
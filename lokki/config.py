@@ -166,9 +166,12 @@ class LocalConfig:
 
     Attributes:
         store_type: Store type for local runner: "local" or "memory".
+        max_workers: Worker threads for map items. LOKKI_MAP_WORKERS takes
+            precedence; when neither is set, min(64, 4 * CPU count) is used.
     """
 
     store_type: StoreType = "local"
+    max_workers: int | None = None
 
     def __post_init__(self) -> None:
         """Validate local configuration values."""
@@ -176,6 +179,8 @@ class LocalConfig:
             raise ValueError(
                 f"store_type must be 'local' or 'memory', got '{self.store_type}'"
             )
+        if self.max_workers is not None and self.max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {self.max_workers}")
 
 
 @dataclass(slots=True)
@@ -265,6 +270,7 @@ class LokkiConfig:
         )
         local_cfg = LocalConfig(
             store_type=local_config.get("store_type", "local"),
+            max_workers=local_config.get("max_workers"),
         )
         include_cfg = IncludeConfig(
             paths=include_config.get("paths", []),
@@ -14,7 +14,7 @@ __all__ = [
     "StoreType",
 ]
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Literal, TypedDict
 
@@ -113,6 +113,23 @@ class StepNode:
         timeout_seconds: Timeout for Batch jobs (overrides global config).
     """
 
+    __slots__ = (
+        "fn",
+        "name",
+        "retry",
+        "job_type",
+        "vcpu",
+        "memory_mb",
+        "timeout_seconds",
+        "_default_args",
+        "_default_kwargs",
+        "_flow_kwargs",
+        "_next",
+        "_prev",
+        "_map_block",
+        "_closes_map_block",
+    )
+
     def __init__(
         self,
         fn: Callable[..., Any],
@@ -224,6 +241,17 @@ class MapBlock:
         .agg(step) - Close block and aggregate results
     """
 
+    __slots__ = (
+        "source",
+        "inner_head",
+        "inner_tail",
+        "_next",
+        "_flow_kwargs",
+        "concurrency_limit",
+        "direct_pass",
+        "_closed",
+    )
+
     def __init__(
         self,
         source: StepNode,
@@ -244,14 +272,16 @@ class MapBlock:
     @property
     def inner_steps(self) -> list[StepNode]:
         """Get all inner steps as a list."""
-        steps = []
+        return list(self._iter_inner_steps())
+
+    def _iter_inner_steps(self) -> Iterator[StepNode]:
+        """Yield inner steps from head to tail."""
         current: StepNode | None = self.inner_head
         while current is not None:
-            steps.append(current)
+            yield current
             if current is self.inner_tail:
-                break
+                return
             current = current._next
-        return steps
 
     def map(self, step_or_steps: StepNode | list[StepNode]) -> MapBlock:
         """Add step(s) to the inner chain.
@@ -2,6 +2,7 @@
 
 __all__ = ["TaskEntry", "MapOpenEntry", "MapCloseEntry", "GraphEntry", "FlowGraph"]
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
 from lokki.decorators import JobType, MapBlock, StepNode
@@ -17,6 +18,7 @@ class TaskEntry:
         vcpu: vCPUs for Batch jobs (overrides global config).
         memory_mb: Memory in MB for Batch jobs (overrides global config).
         timeout_seconds: Timeout in seconds for Batch jobs (overrides global config).
+        is_map_source: True if the step's result feeds a map block.
     """
 
     node: StepNode
@@ -24,6 +26,7 @@ class TaskEntry:
     vcpu: int | None = None
     memory_mb: int | None = None
     timeout_seconds: int | None = None
+    is_map_source: bool = False
 
 
 @dataclass(slots=True)
@@ -115,101 +118,81 @@ class FlowGraph:
         Args:
             head: The starting StepNode of the chain.
         """
-        processed_nodes: set[int] = set()
-        processed_blocks: set[int] = set()
-
+        entries: list[GraphEntry] = []
+        errors: list[str] = []
+        visited: set[int] = set()
         current: StepNode | None = head
+        # False right after a map block: its aggregation step was already
+        # emitted as the block's MapCloseEntry
+        is_task = True
 
-        while current is not None:
-            if id(current) in processed_nodes:
-                break
-
-            processed_nodes.add(id(current))
+        while current is not None and id(current) not in visited:
+            visited.add(id(current))
 
-            if (
-                current._map_block is not None
-                and id(current._map_block) not in processed_blocks
-            ):
-                processed_blocks.add(id(current._map_block))
-                self.entries.append(
+            block = current._map_block
+            if is_task:
+                entries.append(
                     TaskEntry(
                         node=current,
                         job_type=current.job_type,
                         vcpu=current.vcpu,
                         memory_mb=current.memory_mb,
                         timeout_seconds=current.timeout_seconds,
+                        is_map_source=block is not None and block.source is current,
                     )
                 )
-                self._resolve_map_block(current._map_block)
-                if (
-                    current._map_block._next is not None
-                    and current._map_block._next._closes_map_block
-                ):
-                    processed_nodes.add(id(current._map_block._next))
-                current = current._map_block._next
+
+            if block is not None and block.source is current:
+                map_entries = self._resolve_map_block(block)
+                if not map_entries[0].inner_steps:
+                    errors.append(f"Map block '{block.source.name}' has no inner steps")
+                entries.extend(map_entries)
+                current = block._next
+                is_task = False
             else:
-                self.entries.append(
-                    TaskEntry(
-                        node=current,
-                        job_type=current.job_type,
-                        vcpu=current.vcpu,
-                        memory_mb=current.memory_mb,
-                        timeout_seconds=current.timeout_seconds,
-                    )
-                )
                 current = current._next
+                is_task = True
 
-        self._validate()
+        self.entries = entries
+        self._validate(errors)
 
-    def _resolve_map_block(self, block: MapBlock) -> None:
+    def _resolve_map_block(
+        self, block: MapBlock
+    ) -> tuple[MapOpenEntry] | tuple[MapOpenEntry, MapCloseEntry]:
         """Resolve a MapBlock into MapOpenEntry and MapCloseEntry.
 
         Args:
             block: The MapBlock to resolve.
+
+        Returns:
+            The block's MapOpenEntry, followed by its MapCloseEntry if the
+            block is closed with an aggregation step.
         """
-        inner_steps: list[StepNode] = []
-        step: StepNode | None = block.inner_head
-        while step is not None:
-            inner_steps.append(step)
-            if step is block.inner_tail:
-                break
-            step = step._next
-
-        has_aggregation = block._closed
-
-        self.entries.append(
-            MapOpenEntry(
-                source=block.source,
-                inner_steps=inner_steps,
-                concurrency_limit=block.concurrency_limit,
-                has_aggregation=has_aggregation,
-                direct_pass=block.direct_pass,
-            )
+        open_entry = MapOpenEntry(
+            source=block.source,
+            inner_steps=block.inner_steps,
+            concurrency_limit=block.concurrency_limit,
+            has_aggregation=block._closed,
+            direct_pass=block.direct_pass,
         )
 
         if block._next is not None and block._next._closes_map_block:
-            self.entries.append(MapCloseEntry(agg_step=block._next))
+            return open_entry, MapCloseEntry(agg_step=block._next)
+        return (open_entry,)
+
+    def _validate(self, errors: Sequence[str] = ()) -> None:
+        """Raise if the graph is empty or resolution found errors.
 
-    def _validate(self) -> None:
-        """Validate the resolved graph for common errors.
+        Per-entry checks (e.g. map blocks without inner steps) are made while
+        the chain is resolved, so the entries are not walked a second time.
 
-        Checks:
-        - No empty graphs (no entries)
-        - Map blocks have inner steps
+        Args:
+            errors: Errors collected during resolution.
 
         Raises:
             GraphValidationError: If graph validation fails
         """
-        errors: list[str] = []
-
-        # Check for empty map blocks
-        for entry in self.entries:
-            if isinstance(entry, MapOpenEntry):
-                if not entry.inner_steps:
-                    errors.append(f"Map block '{entry.source.name}' has no inner steps")
-
-        # Check for unreachable steps (steps not in the main chain)
-        # This is already prevented by the graph resolution logic, but we check anyway
+        errors = list(errors)
         if not self.entries:
             errors.append(
                 "Graph has no entries - flow function must return a step chain"
@@ -5,9 +5,9 @@ from __future__ import annotations
 import json
 import logging
 import sys
+import time
 import uuid
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 
@@ -24,6 +24,11 @@ __all__ = [
 ]
 
 
+# Progress bars for every fill level, indexed by the number of filled cells
+_BAR_LEN = 20
+_BARS = tuple("=" * f + ">" + " " * (_BAR_LEN - f) for f in range(_BAR_LEN + 1))
+
+
 class LogFormat(Enum):
     HUMAN = "human"
     JSON = "json"
@@ -62,12 +67,18 @@ class HumanFormatter(logging.Formatter):
     def __init__(self, config: LoggingConfig) -> None:
         super().__init__()
         self.config = config
+        # (epoch second, formatted prefix) of the last formatted timestamp
+        self._ts_cache: tuple[int, str] = (-1, "")
 
     def format(self, record: logging.LogRecord) -> str:
         timestamp = ""
         if self.config.show_timestamps:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            timestamp = f"{timestamp} - "
+            second = int(record.created)
+            cached_second, timestamp = self._ts_cache
+            if second != cached_second:
+                local = time.localtime(second)
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S - ", local)
+                self._ts_cache = (second, timestamp)
 
         level = record.levelname
         message = record.getMessage()
@@ -80,18 +91,36 @@ def generate_correlation_id() -> str:
     return str(uuid.uuid4())
 
 
+# Optional record attributes copied into JSON log lines when set
+_JSON_EXTRA_KEYS = ("duration", "status", "total", "completed", "failed", "duration_ms")
+
+# Compact separators: no whitespace to emit, and log lines stay smaller
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
 class JsonFormatter(logging.Formatter):
     """JSON structured log formatter."""
 
     def __init__(self, config: LoggingConfig) -> None:
         super().__init__()
         self.config = config
+        # (epoch second, ISO 8601 UTC prefix) of the last formatted timestamp
+        self._ts_cache: tuple[int, str] = (-1, "")
+
+    def _format_ts(self, created: float) -> str:
+        second = int(created)
+        cached_second, prefix = self._ts_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._ts_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1_000_000):06d}Z"
 
     def format(self, record: logging.LogRecord) -> str:
+        fields = record.__dict__
         data: dict[str, Any] = {
             "level": record.levelname,
-            "ts": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
-            "event": getattr(record, "event", "log"),
+            "ts": self._format_ts(record.created),
+            "event": fields.get("event", "log"),
             "message": record.getMessage(),
             "correlation_id": self.config.correlation_id,
             "flow_name": self.config.flow_name,
@@ -99,39 +128,45 @@ class JsonFormatter(logging.Formatter):
         }
 
         # Add step_name (and keep step for backward compatibility)
-        step_name = getattr(record, "step", None)
+        step_name = fields.get("step")
         if step_name:
             data["step"] = step_name
             data["step_name"] = step_name
 
-        for key in (
-            "duration",
-            "status",
-            "total",
-            "completed",
-            "failed",
-            "duration_ms",
-        ):
-            val = getattr(record, key, None)
+        for key in _JSON_EXTRA_KEYS:
+            val = fields.get(key)
             if val is not None:
                 data[key] = val
 
-        return json.dumps(data)
+        return _dumps(data)
 
 
 def get_logger(name: str, config: LoggingConfig) -> logging.Logger:
-    """Create a configured logger."""
+    """Create a configured logger.
+
+    Reconfiguring a logger reuses its existing stdout handler and only swaps
+    the formatter, so repeated calls never stack handlers.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, config.level, logging.INFO))
-    logger.handlers.clear()
 
-    handler = logging.StreamHandler(sys.stdout)
+    handlers = logger.handlers
+    if (
+        len(handlers) == 1
+        and type(handlers[0]) is logging.StreamHandler
+        and handlers[0].stream is sys.stdout
+    ):
+        handler = handlers[0]
+    else:
+        logger.handlers.clear()
+        handler = logging.StreamHandler(sys.stdout)
+        logger.addHandler(handler)
+
     handler.setFormatter(
         JsonFormatter(config)
         if config.format == LogFormat.JSON.value
         else HumanFormatter(config)
     )
-    logger.addHandler(handler)
     logger.propagate = False
 
     return logger
@@ -140,6 +175,15 @@ def get_logger(name: str, config: LoggingConfig) -> logging.Logger:
 class StepLogger:
     """Logger for step lifecycle events."""
 
+    __slots__ = (
+        "step_name",
+        "logger",
+        "start_time",
+        "correlation_id",
+        "flow_name",
+        "run_id",
+    )
+
     def __init__(
         self,
         step_name: str,
@@ -150,7 +194,7 @@ class StepLogger:
     ) -> None:
         self.step_name = step_name
         self.logger = logger
-        self.start_time: datetime | None = None
+        self.start_time: float | None = None
         self.correlation_id = correlation_id
         self.flow_name = flow_name
         self.run_id = run_id
@@ -171,7 +215,7 @@ class StepLogger:
 
     def start(self) -> None:
         """Log step start."""
-        self.start_time = datetime.now()
+        self.start_time = time.perf_counter()
         extra = self._get_base_extra("step_start")
         self.logger.info(f"Step '{self.step_name}' started", extra=extra)
 
@@ -230,6 +274,20 @@ class StepLogger:
 class MapProgressLogger:
     """Logger for map task progress."""
 
+    __slots__ = (
+        "step_name",
+        "total_items",
+        "logger",
+        "config",
+        "completed",
+        "failed",
+        "start_time",
+        "_item_time_total",
+        "_timed_items",
+        "_last_item_time",
+        "_log_at",
+    )
+
     def __init__(
         self,
         step_name: str,
@@ -243,10 +301,27 @@ class MapProgressLogger:
         self.config = config
         self.completed = 0
         self.failed = 0
-        self._last_pct = -1
-        self.start_time: datetime | None = None
-        self._item_times: list[float] = []
-        self._last_item_time: datetime | None = None
+        self.start_time: float | None = None
+        self._item_time_total = 0.0
+        self._timed_items = 0
+        self._last_item_time: float | None = None
+        self._log_at = self._progress_thresholds(total_items, config.progress_interval)
+
+    @staticmethod
+    def _progress_thresholds(total_items: int, interval: int) -> frozenset[int]:
+        """Completed counts at which a progress line is logged.
+
+        A line is logged the first time the completed percentage reaches each
+        multiple of the effective interval (at least 10%), and on completion.
+        """
+        if total_items <= 0:
+            return frozenset()
+        pct_interval = max(10, 100 // (100 // interval)) if interval <= 100 else 100
+        # Smallest count whose floored percentage reaches each multiple
+        return frozenset(
+            -(-pct * total_items // 100)
+            for pct in range(pct_interval, 100, pct_interval)
+        ) | {total_items}
 
     def _get_base_extra(self, event: str) -> dict[str, Any]:
         """Get base extra fields for log records."""
@@ -264,7 +339,7 @@ class MapProgressLogger:
 
     def start(self) -> None:
         """Log map start."""
-        self.start_time = datetime.now()
+        self.start_time = time.perf_counter()
         self._last_item_time = self.start_time
         extra = self._get_base_extra("map_start")
         extra["total"] = self.total_items
@@ -274,38 +349,25 @@ class MapProgressLogger:
 
     def update(self, status: str) -> None:
         """Update progress when an item completes."""
-        now = datetime.now()
-        if self._last_item_time:
-            item_time = (now - self._last_item_time).total_seconds()
-            self._item_times.append(item_time)
+        now = time.perf_counter()
+        if self._last_item_time is not None:
+            self._item_time_total += now - self._last_item_time
+            self._timed_items += 1
         self._last_item_time = now
 
         if status == "completed":
             self.completed += 1
+            if self.completed in self._log_at:
+                self._log_progress()
         elif status == "failed":
             self.failed += 1
 
-        pct = (
-            int(100 * self.completed / self.total_items)
-            if self.total_items > 0
-            else 100
-        )
-
-        interval = self.config.progress_interval
-        pct_interval = (
-            max(10, 100 // (100 // interval)) if self.total_items > 0 else 100
-        )
-
-        if pct >= self._last_pct + pct_interval or self.completed == self.total_items:
-            self._last_pct = pct
-            self._log_progress()
-
     def _get_timing_stats(self) -> dict[str, float]:
         """Calculate timing statistics."""
-        if not self._item_times:
+        if not self._timed_items:
             return {"avg_item_time": 0.0, "estimated_completion": 0.0}
 
-        avg_item_time = sum(self._item_times) / len(self._item_times)
+        avg_item_time = self._item_time_total / self._timed_items
         remaining_items = self.total_items - self.completed - self.failed
         estimated_completion = avg_item_time * remaining_items
 
@@ -315,18 +377,19 @@ class MapProgressLogger:
         }
 
     def _log_progress(self) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         pct = (
             int(100 * self.completed / self.total_items)
             if self.total_items > 0
             else 100
         )
-        bar_len = 20
         filled = (
-            int(bar_len * self.completed / self.total_items)
+            _BAR_LEN * self.completed // self.total_items
             if self.total_items > 0
-            else bar_len
+            else _BAR_LEN
         )
-        bar = "=" * filled + ">" + " " * (bar_len - filled)
+        bar = _BARS[filled]
 
         timing_stats = self._get_timing_stats()
 
@@ -347,8 +410,8 @@ class MapProgressLogger:
 
     def complete(self) -> None:
         """Log map completion."""
-        if self.start_time:
-            duration = (datetime.now() - self.start_time).total_seconds()
+        if self.start_time is not None:
+            duration = time.perf_counter() - self.start_time
         else:
             duration = 0.0
 
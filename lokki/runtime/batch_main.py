@@ -33,11 +33,15 @@ def main() -> None:
     handler = make_batch_handler(step_func)
 
     event = {}
-    if input_data:
+    # Only an object or array can be an event; anything else is raw input,
+    # so large non-JSON payloads are not run through the decoder first
+    if input_data.lstrip()[:1] in ("{", "["):
         try:
             event = json.loads(input_data)
         except json.JSONDecodeError:
             event = {"input_data": input_data}
+    elif input_data:
+        event = {"input_data": input_data}
 
     result = handler(event)
 
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 import os
-from datetime import datetime
+import time
 from typing import Any
 
 from lokki.config import load_config
@@ -36,14 +37,19 @@ def make_batch_handler(
         A handler function compatible with AWS Batch container
     """
     logger = get_logger("lokki.runtime.batchjob", LoggingConfig())
+    # Warm containers reuse the store and its S3 client across invocations
+    get_store = functools.cache(_get_store)
 
-    def batch_handler(event: dict[str, Any]) -> dict[str, Any]:
-        cfg = load_config()
-        flow_name = cfg.flow_name or os.environ.get("LOKKI_FLOW_NAME", "unknown")
-        step_name = fn.__name__
+    # Config and environment do not change within a container
+    cfg = load_config()
+    flow_name = cfg.flow_name or os.environ.get("LOKKI_FLOW_NAME", "unknown")
+    step_name = fn.__name__
 
+    def batch_handler(event: dict[str, Any]) -> dict[str, Any]:
         logger.info(
-            f"Batch job invoked: flow={flow_name}, step={step_name}",
+            "Batch job invoked: flow=%s, step=%s",
+            flow_name,
+            step_name,
             extra={
                 "event": "batch_invoke",
                 "flow": flow_name,
@@ -67,14 +73,15 @@ def make_batch_handler(
         if input_data is None:
             input_data = {}
 
-        store = _get_store()
+        store = get_store()
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             if isinstance(input_data, str):
                 logger.info(
-                    f"Reading input from {input_data}",
+                    "Reading input from %s",
+                    input_data,
                     extra={"event": "input_read", "step": step_name},
                 )
                 input_data = store.read(input_data)
@@ -82,72 +89,83 @@ def make_batch_handler(
                 isinstance(x, str) for x in input_data
             ):
                 logger.info(
-                    f"Reading {len(input_data)} inputs from S3",
+                    "Reading %d inputs from S3",
+                    len(input_data),
                     extra={"event": "input_read", "step": step_name},
                 )
-                input_data = [store.read(url) for url in input_data]
+                input_data = Runtime.read_inputs(store, input_data)
 
             # Call step function using Runtime.call_step
             result = Runtime.call_step(fn, input_data, flow_params)
 
             # Handle None result (side-effect only step)
             if result is None:
+                duration = time.perf_counter() - start_time
                 logger.info(
-                    f"Batch step completed: {step_name} in "
-                    f"{(datetime.now() - start_time).total_seconds():.3f}s (no output)",
+                    "Batch step completed: %s in %.3fs (no output)",
+                    step_name,
+                    duration,
                     extra={
                         "event": "step_complete",
                         "step": step_name,
-                        "duration": (datetime.now() - start_time).total_seconds(),
+                        "duration": duration,
                         "status": "success",
                     },
                 )
                 return {"input": None, "flow": lambda_event.flow.to_dict()}
 
-            output_url = store.write(flow_name, run_id, step_name, result)
-
+            # A list result is only read item by item through its manifest, so
+            # it is not also stored whole
             if isinstance(result, list):
-                item_urls = []
-                for i, item in enumerate(result):
-                    item_url = store.write(flow_name, run_id, f"{step_name}/{i}", item)
-                    item_urls.append(item_url)
+                item_urls = Runtime.write_items(
+                    store, flow_name, run_id, step_name, result
+                )
 
                 manifest_url = store.write_manifest(
                     flow_name, run_id, step_name, item_urls
                 )
 
+                duration = time.perf_counter() - start_time
                 logger.info(
-                    f"Batch step completed: {step_name} in "
-                    f"{(datetime.now() - start_time).total_seconds():.3f}s",
+                    "Batch step completed: %s in %.3fs",
+                    step_name,
+                    duration,
                     extra={
                         "event": "step_complete",
                         "step": step_name,
-                        "duration": (datetime.now() - start_time).total_seconds(),
+                        "duration": duration,
                         "status": "success",
                     },
                 )
                 return {"input": manifest_url, "flow": lambda_event.flow.to_dict()}
 
+            output_url = store.write(flow_name, run_id, step_name, result)
+
+            duration = time.perf_counter() - start_time
             logger.info(
-                f"Batch step completed: {step_name} in "
-                f"{(datetime.now() - start_time).total_seconds():.3f}s",
+                "Batch step completed: %s in %.3fs",
+                step_name,
+                duration,
                 extra={
                     "event": "step_complete",
                     "step": step_name,
-                    "duration": (datetime.now() - start_time).total_seconds(),
+                    "duration": duration,
                     "status": "success",
                 },
             )
             return {"input": output_url, "flow": lambda_event.flow.to_dict()}
 
         except Exception as e:
+            duration = time.perf_counter() - start_time
             logger.error(
-                f"Batch step failed: {step_name} after "
-                f"{(datetime.now() - start_time).total_seconds():.3f}s: {e}",
+                "Batch step failed: %s after %.3fs: %s",
+                step_name,
+                duration,
+                e,
                 extra={
                     "event": "step_fail",
                     "step": step_name,
-                    "duration": (datetime.now() - start_time).total_seconds(),
+                    "duration": duration,
                     "status": "failed",
                 },
             )
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import os
-from datetime import datetime
+import time
 from typing import TYPE_CHECKING, Any
 
 from lokki.logging import LoggingConfig, get_logger
@@ -41,13 +43,20 @@ def make_handler(
         A lambda_handler function compatible with AWS Lambda
     """
     logger = get_logger("lokki.runtime", LoggingConfig())
+    # The environment does not change within a container
+    flow_name = os.environ.get("LOKKI_FLOW_NAME", "unknown")
+    step_name = fn.__name__
+    # Inspect the step's signature during Init; Runtime caches it per function
+    with contextlib.suppress(TypeError, ValueError):
+        Runtime.accepts_kwargs(fn)
+    # Warm containers reuse the store and its S3 client across invocations
+    get_store = functools.cache(_get_store)
+    # The handler is built at import, so this moves client setup into Lambda
+    # Init. A misconfigured store is left to fail on invocation, as before
+    with contextlib.suppress(ValueError):
+        get_store()
 
     def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
-        assert "LOKKI_FLOW_NAME" in os.environ
-
-        flow_name = os.environ.get("LOKKI_FLOW_NAME", "unknown")
-        step_name = fn.__name__
-
         # Parse event - try new format first, fall back to old format
         lambda_event = _parse_event(event)
 
@@ -64,7 +73,9 @@ def make_handler(
             run_id = f"nocache-{uuid.uuid4().hex[:8]}"
 
         logger.info(
-            f"Lambda invoked: flow={flow_name}, step={step_name}",
+            "Lambda invoked: flow=%s, step=%s",
+            flow_name,
+            step_name,
             extra={
                 "event": "lambda_invoke",
                 "flow": flow_name,
@@ -77,9 +88,9 @@ def make_handler(
         if is_first_step:
             input_data = {}
 
-        store = _get_store()
+        store = get_store()
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         # Compute input hash for cache validation
         from lokki.store.utils import _hash_input
@@ -92,7 +103,8 @@ def make_handler(
             stored_input_hash = store.get_input_hash(flow_name, run_id, step_name)
             if stored_input_hash == input_hash:
                 logger.info(
-                    f"Cache hit for step '{step_name}', returning cached result",
+                    "Cache hit for step '%s', returning cached result",
+                    step_name,
                     extra={"event": "cache_skip", "step": step_name, "run_id": run_id},
                 )
                 cached_result = store.read_cached(flow_name, run_id, step_name)
@@ -105,7 +117,8 @@ def make_handler(
             # Read input from S3 if it's a URL string or list of URLs
             if isinstance(input_data, str):
                 logger.info(
-                    f"Reading input from {input_data}",
+                    "Reading input from %s",
+                    input_data,
                     extra={"event": "input_read", "step": step_name, "run_id": run_id},
                 )
                 input_data = store.read(input_data)
@@ -113,10 +126,11 @@ def make_handler(
                 isinstance(x, str) for x in input_data
             ):
                 logger.info(
-                    f"Reading {len(input_data)} inputs from S3",
+                    "Reading %d inputs from S3",
+                    len(input_data),
                     extra={"event": "input_read", "step": step_name, "run_id": run_id},
                 )
-                input_data = [store.read(url) for url in input_data]
+                input_data = Runtime.read_inputs(store, input_data)
 
             # Call step function using Runtime.call_step
             if is_first_step:
@@ -126,13 +140,15 @@ def make_handler(
 
             # Handle None result (side-effect only step)
             if result is None:
+                duration = time.perf_counter() - start_time
                 logger.info(
-                    f"Step completed: {step_name} in "
-                    f"{(datetime.now() - start_time).total_seconds():.3f}s (no output)",
+                    "Step completed: %s in %.3fs (no output)",
+                    step_name,
+                    duration,
                     extra={
                         "event": "step_complete",
                         "step": step_name,
-                        "duration": (datetime.now() - start_time).total_seconds(),
+                        "duration": duration,
                         "status": "success",
                         "run_id": run_id,
                     },
@@ -146,35 +162,38 @@ def make_handler(
 
             # Handle map results (list) - write manifest as list of URLs
             if isinstance(result, list):
-                item_urls = []
-                for i, item in enumerate(result):
-                    item_url = store.write(flow_name, run_id, f"{step_name}/{i}", item)
-                    item_urls.append(item_url)
+                item_urls = Runtime.write_items(
+                    store, flow_name, run_id, step_name, result
+                )
 
                 manifest_url = store.write_manifest(
                     flow_name, run_id, step_name, item_urls
                 )
 
+                duration = time.perf_counter() - start_time
                 logger.info(
-                    f"Step completed: {step_name} in "
-                    f"{(datetime.now() - start_time).total_seconds():.3f}s",
+                    "Step completed: %s in %.3fs",
+                    step_name,
+                    duration,
                     extra={
                         "event": "step_complete",
                         "step": step_name,
-                        "duration": (datetime.now() - start_time).total_seconds(),
+                        "duration": duration,
                         "status": "success",
                         "run_id": run_id,
                     },
                 )
                 return {"input": manifest_url, "flow": lambda_event.flow.to_dict()}
 
+            duration = time.perf_counter() - start_time
             logger.info(
-                f"Step completed: {step_name} in "
-                f"{(datetime.now() - start_time).total_seconds():.3f}s",
+                "Step completed: %s in %.3fs",
+                step_name,
+                duration,
                 extra={
                     "event": "step_complete",
                     "step": step_name,
-                    "duration": (datetime.now() - start_time).total_seconds(),
+                    "duration": duration,
                     "status": "success",
                     "run_id": run_id,
                 },
@@ -182,13 +201,16 @@ def make_handler(
             return {"input": output_url, "flow": lambda_event.flow.to_dict()}
 
         except Exception as e:
+            duration = time.perf_counter() - start_time
             logger.error(
-                f"Step failed: {step_name} after "
-                f"{(datetime.now() - start_time).total_seconds():.3f}s: {e}",
+                "Step failed: %s after %.3fs: %s",
+                step_name,
+                duration,
+                e,
                 extra={
                     "event": "step_error",
                     "step": step_name,
-                    "duration": (datetime.now() - start_time).total_seconds(),
+                    "duration": duration,
                     "error": str(e),
                     "run_id": run_id,
                 },
@@ -210,21 +232,18 @@ def _parse_event(event: dict[str, Any]) -> LambdaEvent:
         # Extract flow from first item to preserve it
         run_id = "unknown"
         flow_params = {}
-        input_items = event
-        if event and isinstance(event[0], dict):
-            first = event[0]
-            if "flow" in first and isinstance(first["flow"], dict):
-                flow = first["flow"]
-                run_id = flow.get("run_id", "unknown")
-                flow_params = flow.get("params", {})
+        first = event[0] if event else None
+        flow = first.get("flow") if isinstance(first, dict) else None
+        if isinstance(flow, dict):
+            run_id = flow.get("run_id", "unknown")
+            flow_params = flow.get("params", {})
         return LambdaEvent(
             flow=FlowContext(run_id=run_id, params=flow_params),
-            input=input_items,
+            input=event,
         )
 
     # Handle dict input - new format {"flow": {...}, "input": ...}
-    if "flow" in event and isinstance(event["flow"], dict):
-        flow_data = event["flow"]
+    if isinstance(event, dict) and isinstance(flow_data := event.get("flow"), dict):
         return LambdaEvent(
             flow=FlowContext.from_dict(flow_data),
             input=event.get("input"),
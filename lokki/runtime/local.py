@@ -6,14 +6,11 @@ It mimics AWS Step Functions behavior using local filesystem storage.
 
 from __future__ import annotations
 
-import gzip
 import json
 import os
-import pickle
+import threading
 import time
-from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from lokki.decorators import RetryConfig, StepNode
@@ -25,6 +22,91 @@ from lokki.store.protocol import TransientStore
 if TYPE_CHECKING:
     pass
 
+# Map items mostly wait on pickling, gzip and file IO, which release the GIL,
+# so the default pool oversubscribes the cores
+_DEFAULT_MAP_WORKERS = min(64, (os.cpu_count() or 4) * 4)
+
+
+def _map_workers_from_env() -> int | None:
+    """Read the map worker count from LOKKI_MAP_WORKERS.
+
+    Returns:
+        int | None: The worker count, or None if unset or not a positive int.
+    """
+    try:
+        workers = int(os.environ.get("LOKKI_MAP_WORKERS", ""))
+    except ValueError:
+        return None
+    return workers if workers > 0 else None
+
+
+def _run_step_for_item(
+    store: TransientStore,
+    flow_name: str,
+    run_id: str,
+    step_node: StepNode,
+    item_idx: int,
+    item_data: Any,
+    flow_params: dict[str, Any],
+) -> Any:
+    """Run one inner map step for one item, retrying per the step's config.
+
+    The result is written to the store from the worker, so items are
+    serialized in parallel rather than one by one as their futures complete.
+
+    Returns:
+        Any: The step's result.
+    """
+    retry_config = step_node.retry
+    last_exception: Exception | None = None
+    for attempt in range(retry_config.retries + 1):
+        try:
+            result = Runtime.call_step(step_node.fn, item_data, flow_params)
+        except Exception as e:
+            if not any(isinstance(e, exc_type) for exc_type in retry_config.exceptions):
+                raise
+            last_exception = e
+            if attempt < retry_config.retries:
+                delay = min(
+                    retry_config.delay * (retry_config.backoff**attempt),
+                    retry_config.max_delay,
+                )
+                time.sleep(delay)
+        else:
+            store.write(flow_name, run_id, f"{step_node.name}/{item_idx}", result)
+            return result
+    if last_exception:
+        raise last_exception
+
+
+def _run_chain(
+    store: TransientStore,
+    flow_name: str,
+    run_id: str,
+    entry: MapOpenEntry,
+    flow_params: dict[str, Any],
+    item_idx: int,
+    item_data: Any,
+) -> None:
+    """Run a map block's whole inner chain for one item.
+
+    Each item runs on its own, so fast items are not held back by a barrier
+    after every inner step.
+    """
+    for step_node in entry.inner_steps:
+        result = _run_step_for_item(
+            store, flow_name, run_id, step_node, item_idx, item_data, flow_params
+        )
+        # For next step: if direct_pass, use the in-memory result,
+        # otherwise read it back like the deployed state machine does
+        if entry.direct_pass:
+            item_data = result
+        else:
+            result_path = store._get_path(
+                flow_name, run_id, f"{step_node.name}/{item_idx}", "output.pkl.gz"
+            )
+            item_data = store.read(str(result_path))
+
 
 class LocalRunner:
     """Executes lokki flows locally.
@@ -37,10 +119,13 @@ class LocalRunner:
         self,
         logging_config: LoggingConfig | None = None,
         store_type: str | None = None,
+        max_workers: int | None = None,
     ) -> None:
         self.logging_config = logging_config or LoggingConfig()
         self.logger = get_logger("lokki.runner", self.logging_config)
         self._store_type = store_type  # Parameter takes priority
+        self._max_workers = max_workers  # Parameter takes priority
+        self._cleanup_thread: threading.Thread | None = None
 
     def _get_store_type(self) -> str:
         """Get store type with priority: param > env > config."""
@@ -53,9 +138,33 @@ class LocalRunner:
         config = load_config()
         return config.local_cfg.store_type
 
+    def _get_max_workers(self) -> int:
+        """Get map worker count with priority: param > env > config > default."""
+        if self._max_workers:
+            return self._max_workers
+        if env_workers := _map_workers_from_env():
+            return env_workers
+        from lokki.config import load_config
+
+        return load_config().local_cfg.max_workers or _DEFAULT_MAP_WORKERS
+
+    def wait_for_cleanup(self) -> None:
+        """Block until the store cleanup of the previous run has finished."""
+        if self._cleanup_thread is not None:
+            self._cleanup_thread.join()
+            self._cleanup_thread = None
+
+    def _cleanup_store(self, store: TransientStore) -> None:
+        try:
+            store.cleanup()
+        except Exception as e:
+            self.logger.warning(f"Failed to clean up run data: {e}")
+
     def run(self, graph: FlowGraph, params: dict[str, Any] | None = None) -> Any:
         from lokki.store import LocalStore, MemoryStore  # noqa: F401
 
+        self.wait_for_cleanup()
+
         store_type = self._get_store_type()
         store: TransientStore
         if store_type == "memory":
@@ -70,14 +179,24 @@ class LocalRunner:
         if params:
             self.logger.debug(f"Input parameters: {params}")
 
+        # One pool serves every map block in the run
+        executor = ThreadPoolExecutor(
+            max_workers=self._get_max_workers(), thread_name_prefix="lokki-map"
+        )
+
         try:
+            item_count = 0
             for entry in graph.entries:
                 if isinstance(entry, TaskEntry):
                     self._run_task(store, graph.name, run_id, entry, params)
                 elif isinstance(entry, MapOpenEntry):
-                    self._run_map(store, graph.name, run_id, entry, params)
+                    item_count = self._run_map(
+                        store, graph.name, run_id, entry, params, executor
+                    )
                 elif isinstance(entry, MapCloseEntry):
-                    self._run_agg(store, graph.name, run_id, entry, params)
+                    self._run_agg(
+                        store, graph.name, run_id, entry, params, item_count, executor
+                    )
 
             last_entry = graph.entries[-1]
             if isinstance(last_entry, MapCloseEntry):
@@ -95,7 +214,14 @@ class LocalRunner:
                 return None
             return None
         finally:
-            store.cleanup()
+            executor.shutdown()
+            # Removing thousands of small files can take a while; do it off the
+            # caller's path. The next run waits for it, and the thread is
+            # non-daemon, so it also finishes before exit
+            self._cleanup_thread = threading.Thread(
+                target=self._cleanup_store, args=(store,), name="lokki-cleanup"
+            )
+            self._cleanup_thread.start()
 
     def _run_task(
         self,
@@ -119,7 +245,7 @@ class LocalRunner:
                 step_name,
             )
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         last_exception: Exception | None = None
 
         for attempt in range(retry_config.retries + 1):
@@ -128,10 +254,12 @@ class LocalRunner:
                     node, store, flow_name, run_id, params, job_type
                 )
 
-                duration = (datetime.now() - start_time).total_seconds()
+                duration = time.perf_counter() - start_time
                 store.write(flow_name, run_id, step_name, result)
 
-                if isinstance(result, list):
+                # Only a map block reads the manifest; other list results are
+                # passed on whole like any other output
+                if entry.is_map_source and isinstance(result, list):
                     store.write_manifest(flow_name, run_id, step_name, result)
 
                 step_logger.complete(duration)
@@ -151,7 +279,7 @@ class LocalRunner:
                     )
                     time.sleep(delay)
                 else:
-                    duration = (datetime.now() - start_time).total_seconds()
+                    duration = time.perf_counter() - start_time
                     step_logger.fail(duration, e)
 
         if last_exception:
@@ -199,16 +327,19 @@ class LocalRunner:
         run_id: str,
         entry: MapOpenEntry,
         params: dict[str, Any],
-    ) -> None:
+        executor: ThreadPoolExecutor,
+    ) -> int:
+        """Run a map block over the source step's manifest.
+
+        Returns:
+            int: Number of items the block ran over.
+        """
         source_name = entry.source.name
         manifest_path = store._get_path(
             flow_name, run_id, source_name, "map_manifest.json"
         )
         manifest = json.loads(manifest_path.read_text())
 
-        inner_steps = entry.inner_steps
-        direct_pass = entry.direct_pass
-
         step_logger = StepLogger(source_name, self.logger)
         step_logger.start()
 
@@ -217,98 +348,26 @@ class LocalRunner:
         )
         map_logger.start()
 
-        def run_step_for_item(
-            fn: Callable[[Any], Any],
-            item_data: Any,
-            item_idx: int,
-            flow_params: dict[str, Any],
-            retry_config: RetryConfig,
-        ) -> Any:
-            last_exception: Exception | None = None
-            for attempt in range(retry_config.retries + 1):
-                try:
-                    result = Runtime.call_step(fn, item_data, flow_params)
-                    return result
-                except Exception as e:
-                    if not any(
-                        isinstance(e, exc_type) for exc_type in retry_config.exceptions
-                    ):
-                        raise
-                    last_exception = e
-                    if attempt < retry_config.retries:
-                        delay = min(
-                            retry_config.delay * (retry_config.backoff**attempt),
-                            retry_config.max_delay,
-                        )
-                        time.sleep(delay)
-            if last_exception:
-                raise last_exception
-
         # First step always uses manifest items as input
-        current_results: dict[int, Any] = dict(enumerate(manifest))
-
-        for _step_idx, step_node in enumerate(inner_steps):
-            step_name = step_node.name
-            fn = step_node.fn
-            retry_config = step_node.retry
-
-            with ThreadPoolExecutor() as executor:
-                futures = {}
-                for item_idx, item_data in current_results.items():
-                    future = executor.submit(
-                        run_step_for_item,
-                        fn,
-                        item_data,
-                        item_idx,
-                        params,
-                        retry_config,
-                    )
-                    futures[future] = item_idx
-
-                new_results: dict[int, Any] = {}
-                for future in as_completed(futures):
-                    result = future.result()
-                    item_idx = futures[future]
-                    new_results[item_idx] = result
-
-                    # Always write results to S3 for aggregation and persistence
-                    item_result_path = store._get_path(
-                        flow_name, run_id, f"{step_name}/{item_idx}", "output.pkl.gz"
-                    )
-                    item_result_path.parent.mkdir(parents=True, exist_ok=True)
-                    data = gzip.compress(
-                        pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
-                    )
-                    item_result_path.write_bytes(data)
-                    map_logger.update("completed")
-
-            # For next step: if direct_pass, use in-memory results
-            if direct_pass:
-                current_results = new_results
-            else:
-                current_results = self._read_map_results(
-                    store, flow_name, run_id, step_name, len(manifest)
-                )
+        futures = [
+            executor.submit(
+                _run_chain, store, flow_name, run_id, entry, params, item_idx, item_data
+            )
+            for item_idx, item_data in enumerate(manifest)
+        ]
+        try:
+            for future in as_completed(futures):
+                future.result()
+                map_logger.update("completed")
+        except BaseException:
+            # The pool outlives this map block, so drop the queued items
+            for future in futures:
+                future.cancel()
+            raise
 
         map_logger.complete()
         step_logger.complete(0.0)
-
-    def _read_map_results(
-        self,
-        store: TransientStore,
-        flow_name: str,
-        run_id: str,
-        step_name: str,
-        count: int,
-    ) -> dict[int, Any]:
-        """Read map step results from S3."""
-        results = {}
-        for idx in range(count):
-            result_path = store._get_path(
-                flow_name, run_id, f"{step_name}/{idx}", "output.pkl.gz"
-            )
-            results[idx] = store.read(str(result_path))
-        return results
+        return len(manifest)
 
     def _run_agg(
         self,
@@ -317,26 +376,29 @@ class LocalRunner:
         run_id: str,
         entry: MapCloseEntry,
         params: dict[str, Any],
+        item_count: int,
+        executor: ThreadPoolExecutor,
     ) -> None:
+        """Run an aggregation step over the preceding map block's results.
+
+        The item count comes from the map block itself, so the manifest is
+        not parsed a second time just to count it.
+        """
         if entry.agg_step._map_block is None:
             raise ValueError("Aggregation step must follow a map block")
 
-        map_block = entry.agg_step._map_block
-        source_name = map_block.source.name
-        last_inner_step = map_block.inner_tail.name
-
-        manifest = json.loads(
-            store._get_path(
-                flow_name, run_id, source_name, "map_manifest.json"
-            ).read_text()
-        )
+        last_inner_step = entry.agg_step._map_block.inner_tail.name
 
-        inputs = []
-        for idx in range(len(manifest)):
-            result_path = store._get_path(
-                flow_name, run_id, f"{last_inner_step}/{idx}", "output.pkl.gz"
+        result_paths = [
+            str(
+                store._get_path(
+                    flow_name, run_id, f"{last_inner_step}/{idx}", "output.pkl.gz"
+                )
             )
-            inputs.append(store.read(str(result_path)))
+            for idx in range(item_count)
+        ]
+        # Decompress and unpickle the results in parallel; map keeps item order
+        inputs = list(executor.map(store.read, result_paths))
 
         result = Runtime.call_step(entry.agg_step.fn, inputs, params)
 
@@ -2,12 +2,58 @@
 
 from __future__ import annotations
 
+import functools
 import inspect
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    pass
+    from lokki.store import TransientStore
+
+# Upper bound on concurrent store reads when fanning in a list of inputs
+_MAX_READ_WORKERS = 32
+# Upper bound on concurrent store writes when fanning out a list of items
+_MAX_WRITE_WORKERS = 16
+
+
+def _inspect_params(fn: Callable[..., Any]) -> tuple[bool, frozenset[str]]:
+    """Inspect a step function's signature.
+
+    Args:
+        fn: The function to inspect
+
+    Returns:
+        Whether fn accepts **kwargs, and the names of its parameters
+    """
+    params = inspect.signature(fn).parameters
+    accepts_kwargs = any(
+        p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values()
+    )
+    return accepts_kwargs, frozenset(params)
+
+
+_cached_params = functools.lru_cache(maxsize=256)(_inspect_params)
+
+
+def _signature_params(fn: Callable[..., Any]) -> tuple[bool, frozenset[str]]:
+    """Inspect a step function's signature once.
+
+    Step functions are called once per invocation or map item, and
+    ``inspect.signature`` is costly, so the result is cached per function.
+    Unhashable callables, such as instances defining ``__eq__`` without
+    ``__hash__``, are inspected on every call instead.
+
+    Args:
+        fn: The function to inspect
+
+    Returns:
+        Whether fn accepts **kwargs, and the names of its parameters
+    """
+    try:
+        return _cached_params(fn)
+    except TypeError:
+        return _inspect_params(fn)
 
 
 class Runtime:
@@ -27,10 +73,7 @@ class Runtime:
         Returns:
             True if fn accepts **kwargs, False otherwise
         """
-        sig = inspect.signature(fn)
-        return any(
-            p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()
-        )
+        return _signature_params(fn)[0]
 
     @staticmethod
     def filter_flow_params(
@@ -51,15 +94,68 @@ class Runtime:
         if not flow_params:
             return {}
 
+        accepts_kwargs, accepted = _signature_params(fn)
+
         # If function accepts **kwargs, pass all flow params
-        if Runtime.accepts_kwargs(fn):
+        if accepts_kwargs:
             return flow_params
 
         # Otherwise, filter to only explicitly accepted params
-        sig = inspect.signature(fn)
-        accepted = set(sig.parameters.keys())
         return {k: v for k, v in flow_params.items() if k in accepted}
 
+    @staticmethod
+    def read_inputs(store: TransientStore, locations: list[str]) -> list[Any]:
+        """Read a list of stored inputs concurrently.
+
+        Each read is network or disk IO plus decompression, so the reads are
+        spread over a thread pool instead of being done one after another.
+
+        Args:
+            store: Store to read from
+            locations: Locations of the stored inputs
+
+        Returns:
+            The loaded inputs, in the same order as ``locations``
+        """
+        if len(locations) <= 1:
+            return [store.read(location) for location in locations]
+        max_workers = min(_MAX_READ_WORKERS, len(locations))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(store.read, locations))
+
+    @staticmethod
+    def write_items(
+        store: TransientStore,
+        flow_name: str,
+        run_id: str,
+        step_name: str,
+        items: list[Any],
+    ) -> list[str]:
+        """Write each item of a list result concurrently.
+
+        Item ``i`` is written under ``<step_name>/<i>``, the layout the map
+        state reads its inputs from.
+
+        Args:
+            store: Store to write to
+            flow_name: Name of the flow
+            run_id: Run ID
+            step_name: Name of the step that produced the items
+            items: The items to write
+
+        Returns:
+            The locations of the written items, in item order
+        """
+
+        def write_item(item_idx: int, item: Any) -> str:
+            return store.write(flow_name, run_id, f"{step_name}/{item_idx}", item)
+
+        if len(items) <= 1:
+            return [write_item(i, item) for i, item in enumerate(items)]
+        max_workers = min(_MAX_WRITE_WORKERS, len(items))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(write_item, range(len(items)), items))
+
     @staticmethod
     def call_step(
         fn: Callable[..., Any],
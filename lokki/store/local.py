@@ -3,20 +3,78 @@
 from __future__ import annotations
 
 import gzip
-import json
+import os
 import pickle
 import shutil
 import tempfile
-from collections.abc import Sequence
+import uuid
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from lokki.store.protocol import TransientStore
-from lokki.store.utils import _to_json_safe
+from lokki.store.utils import _GZIP_LEVEL, _dumps_manifest
 
 if TYPE_CHECKING:
     pass
 
+# Protocol 5 frames large buffers directly instead of copying them
+_PICKLE_PROTOCOL = 5
+
+# Pickles smaller than this are stored uncompressed; gzip's fixed setup cost
+# outweighs the few bytes it would save
+_RAW_LIMIT = 4096
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@contextmanager
+def _atomic_write_path(path: Path) -> Iterator[Path]:
+    """Yield a temporary sibling of path that replaces it once written.
+
+    Readers never see a partially written file, even when a writer fails
+    midway or another thread reads the same location concurrently.
+    """
+    # Opened like a plain open() would, so the kernel applies the current umask
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    os.close(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class _CompressOnOverflow:
+    """Write-only file object that only gzips output past _RAW_LIMIT bytes.
+
+    Small pickles are written to the file as is. Once the buffered output
+    grows past the limit, everything is streamed through gzip instead.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._buffer = bytearray()
+        self._gzip: gzip.GzipFile | None = None
+
+    def write(self, data: bytes) -> int:
+        if self._gzip is not None:
+            return self._gzip.write(data)
+        self._buffer += data
+        if len(self._buffer) >= _RAW_LIMIT:
+            self._gzip = gzip.open(self._path, "wb", compresslevel=_GZIP_LEVEL)
+            self._gzip.write(self._buffer)
+            self._buffer.clear()
+        return len(data)
+
+    def close(self) -> None:
+        if self._gzip is not None:
+            self._gzip.close()
+        else:
+            self._path.write_bytes(self._buffer)
+
 
 class LocalStore(TransientStore):
     """Local file-based store implementing TransientStore interface."""
@@ -29,6 +87,13 @@ class LocalStore(TransientStore):
         else:
             self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._created_dirs: set[Path] = set()
+
+    def _ensure_dir(self, path: Path) -> None:
+        """Create a directory once per store instead of on every write."""
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
 
     def _get_path(
         self, flow_name: str, run_id: str, step_name: str, filename: str
@@ -44,9 +109,15 @@ class LocalStore(TransientStore):
         input_hash: str | None = None,
     ) -> str:
         path = self._get_path(flow_name, run_id, step_name, "output.pkl.gz")
-        path.parent.mkdir(parents=True, exist_ok=True)
-        data = gzip.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
-        path.write_bytes(data)
+        self._ensure_dir(path.parent)
+        # Stream through the compressor so the pickled bytes are never held
+        # in memory as a whole alongside the compressed copy
+        with _atomic_write_path(path) as tmp_path:
+            f = _CompressOnOverflow(tmp_path)
+            try:
+                pickle.dump(obj, f, protocol=_PICKLE_PROTOCOL)
+            finally:
+                f.close()
         return str(path)
 
     def get_input_hash(
@@ -65,14 +136,27 @@ class LocalStore(TransientStore):
         items: Sequence[Any],
     ) -> str:
         path = self._get_path(flow_name, run_id, step_name, "map_manifest.json")
-        path.parent.mkdir(parents=True, exist_ok=True)
-        serialized_items = _to_json_safe(items)
-        path.write_text(json.dumps(serialized_items))
+        self._ensure_dir(path.parent)
+        data = _dumps_manifest(items).encode()
+        # A re-run of the same step usually produces the same manifest
+        if (
+            path.exists()
+            and path.stat().st_size == len(data)
+            and path.read_bytes() == data
+        ):
+            return str(path)
+        with _atomic_write_path(path) as tmp_path:
+            tmp_path.write_bytes(data)
         return str(path)
 
     def read(self, location: str) -> Any:
-        data = Path(location).read_bytes()
-        return pickle.loads(gzip.decompress(data))
+        with open(location, "rb") as raw:
+            magic = raw.read(2)
+            raw.seek(0)
+            if magic != _GZIP_MAGIC:
+                return pickle.load(raw)
+            with gzip.GzipFile(fileobj=raw) as f:
+                return pickle.load(f)
 
     def exists(
         self,
@@ -90,9 +174,8 @@ class LocalStore(TransientStore):
         step_name: str,
     ) -> Any:
         path = self._get_path(flow_name, run_id, step_name, "output.pkl.gz")
-        data = path.read_bytes()
-        return pickle.loads(gzip.decompress(data))
+        return self.read(str(path))
 
     def cleanup(self) -> None:
-        if self.base_dir.exists():
-            shutil.rmtree(self.base_dir)
+        self._created_dirs.clear()
+        shutil.rmtree(self.base_dir, ignore_errors=True)
@@ -2,14 +2,12 @@
 
 from __future__ import annotations
 
-import gzip
-import json
-import pickle
+import io
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any
 
 from lokki.store.protocol import TransientStore
-from lokki.store.utils import _to_json_safe
+from lokki.store.utils import _dumps_gzip_pickle, _dumps_manifest, _load_gzip_pickle
 
 if TYPE_CHECKING:
     pass
@@ -74,7 +72,7 @@ class MemoryStore(TransientStore):
         input_hash: str | None = None,
     ) -> str:
         key = self._make_key(flow_name, run_id, step_name, "output.pkl.gz")
-        serialized = gzip.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        serialized = _dumps_gzip_pickle(obj)
         self._data[key] = serialized
         return f"memory://{key}"
 
@@ -94,15 +92,14 @@ class MemoryStore(TransientStore):
         items: Sequence[Any],
     ) -> str:
         key = self._make_key(flow_name, run_id, step_name, "map_manifest.json")
-        serialized_items = _to_json_safe(items)
-        self._data[key] = json.dumps(serialized_items)
+        self._data[key] = _dumps_manifest(items)
         return f"memory://{key}"
 
     def read(self, location: str) -> Any:
         if location.startswith("memory://"):
             key = location[9:]
             data = self._data[key]
-            return pickle.loads(gzip.decompress(data))
+            return _load_gzip_pickle(io.BytesIO(data))
         raise ValueError(f"Invalid location: {location}")
 
     def exists(
@@ -122,7 +119,7 @@ class MemoryStore(TransientStore):
     ) -> Any:
         key = self._make_key(flow_name, run_id, step_name, "output.pkl.gz")
         data = self._data[key]
-        return pickle.loads(gzip.decompress(data))
+        return _load_gzip_pickle(io.BytesIO(data))
 
     def cleanup(self) -> None:
         self._data.clear()
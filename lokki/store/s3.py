@@ -2,16 +2,14 @@
 
 from __future__ import annotations
 
-import gzip
-import json
 import os
-import pickle
 from typing import TYPE_CHECKING, Any, cast
 
 from botocore.exceptions import ClientError
 
 from lokki._aws import get_s3_client
 from lokki.store.protocol import TransientStore
+from lokki.store.utils import _dumps_gzip_pickle, _dumps_manifest, _load_gzip_pickle
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -46,7 +44,7 @@ class S3Store(TransientStore):
         input_hash: str | None = None,
     ) -> str:
         key = self._make_key(flow_name, run_id, step_name, "output.pkl.gz")
-        data = gzip.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        data = _dumps_gzip_pickle(obj)
 
         if input_hash:
             self._client.put_object(
@@ -81,8 +79,7 @@ class S3Store(TransientStore):
 
     def read(self, location: str) -> Any:
         bucket, key = self._parse_url(location)
-        data = self._client.get_object(Bucket=bucket, Key=key)["Body"].read()
-        return pickle.loads(gzip.decompress(data))
+        return self._load(bucket, key)
 
     def exists(
         self,
@@ -106,8 +103,15 @@ class S3Store(TransientStore):
         step_name: str,
     ) -> Any:
         key = self._make_key(flow_name, run_id, step_name, "output.pkl.gz")
-        data = self._client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
-        return pickle.loads(gzip.decompress(data))
+        return self._load(self.bucket, key)
+
+    def _load(self, bucket: str, key: str) -> Any:
+        """Stream an object from S3 through gzip into pickle."""
+        body = self._client.get_object(Bucket=bucket, Key=key)["Body"]
+        try:
+            return _load_gzip_pickle(body)
+        finally:
+            body.close()
 
     def write_manifest(
         self,
@@ -120,7 +124,7 @@ class S3Store(TransientStore):
         self._client.put_object(
             Bucket=self.bucket,
             Key=key,
-            Body=json.dumps(items),
+            Body=_dumps_manifest(items).encode(),
             ContentType="application/json",
         )
         return f"s3://{self.bucket}/{key}"
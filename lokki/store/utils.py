@@ -2,10 +2,48 @@
 
 from __future__ import annotations
 
+import gzip
 import hashlib
+import io
 import json
+import os
+import pickle
+from collections.abc import Sequence
 from datetime import date, datetime
-from typing import Any
+from typing import IO, Any
+
+
+def _gzip_level_from_env() -> int:
+    """Read the gzip level for stored artifacts from LOKKI_GZIP_LEVEL.
+
+    Artifacts are written once and read once, so the default favours
+    compression speed (level 1) over size. Invalid values fall back to it.
+    """
+    try:
+        level = int(os.environ.get("LOKKI_GZIP_LEVEL", "1"))
+    except ValueError:
+        return 1
+    return level if 0 <= level <= 9 else 1
+
+
+_GZIP_LEVEL = _gzip_level_from_env()
+
+
+def _dumps_gzip_pickle(obj: Any) -> bytes:
+    """Pickle obj straight into a gzip stream and return the compressed bytes.
+
+    The uncompressed pickle is never held in memory as a whole.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=_GZIP_LEVEL) as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return buffer.getvalue()
+
+
+def _load_gzip_pickle(fileobj: IO[bytes]) -> Any:
+    """Unpickle an object while decompressing a gzip stream."""
+    with gzip.GzipFile(fileobj=fileobj, mode="rb") as f:
+        return pickle.load(f)
 
 
 def _to_json_safe(obj: Any) -> Any:
@@ -19,6 +57,26 @@ def _to_json_safe(obj: Any) -> Any:
     return obj
 
 
+def _json_default(obj: Any) -> Any:
+    """Serialize the non-JSON types _to_json_safe handles, as a json default.
+
+    Unlike _to_json_safe this only runs for objects the C encoder cannot
+    serialize itself, so plain containers are never walked in Python.
+    """
+    if isinstance(obj, datetime | date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_manifest(items: Sequence[Any]) -> str:
+    """Encode map manifest items as compact JSON.
+
+    Manifests can hold thousands of items, so the separators drop the
+    padding spaces the default encoder adds after every comma and colon.
+    """
+    return json.dumps(items, separators=(",", ":"), default=_json_default)
+
+
 def _hash_input(input_data: Any) -> str:
     """Compute a deterministic hash of input data.
 
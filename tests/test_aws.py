@@ -93,6 +93,25 @@ class TestAwsClients:
 
         assert client is not None
 
+    @mock_aws
+    def test_get_logs_client_uses_adaptive_retries(self) -> None:
+        """Test CloudWatch Logs client backs off adaptively when throttled."""
+        from lokki._aws import get_logs_client
+
+        client = get_logs_client()
+
+        assert client.meta.config.retries["mode"] == "adaptive"
+
+    @mock_aws
+    def test_get_s3_client_pool_fits_handler_threads(self) -> None:
+        """Test S3 client has a connection per concurrent handler read."""
+        from lokki._aws import get_s3_client
+        from lokki.runtime.runtime import _MAX_READ_WORKERS
+
+        client = get_s3_client()
+
+        assert client.meta.config.max_pool_connections >= _MAX_READ_WORKERS
+
     @mock_aws
     def test_get_ecr_client_without_endpoint(self) -> None:
         """Test ECR client creation without endpoint."""
@@ -155,3 +174,20 @@ class TestAwsClients:
             client = get_batch_client(region="us-west-1")
 
         assert client is not None
+
+    def test_clients_share_session_per_region(self) -> None:
+        """Test that clients for one region are created from one session."""
+        from lokki._aws import _get_session, get_cf_client, get_ecr_client
+
+        with patch("lokki._aws.boto3.session.Session") as mock_session:
+            _get_session.cache_clear()
+            try:
+                get_cf_client("eu-north-1")
+                get_ecr_client("eu-north-1")
+                get_ecr_client("eu-central-1")
+            finally:
+                _get_session.cache_clear()
+
+        assert mock_session.call_count == 2
+        mock_session.assert_any_call(region_name="eu-north-1")
+        mock_session.assert_any_call(region_name="eu-central-1")
@@ -110,3 +110,66 @@ class TestCacheValidation:
         tag = "input_hash=" + input_hash
         assert tag.startswith("input_hash=")
         assert len(input_hash) == 16
+
+
+class TestGzipLevel:
+    """Tests for the LOKKI_GZIP_LEVEL override."""
+
+    def test_defaults_to_fast_level(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the gzip level defaults to 1 when unset."""
+        from lokki.store.utils import _gzip_level_from_env
+
+        monkeypatch.delenv("LOKKI_GZIP_LEVEL", raising=False)
+        assert _gzip_level_from_env() == 1
+
+    def test_env_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test LOKKI_GZIP_LEVEL overrides the gzip level."""
+        from lokki.store.utils import _gzip_level_from_env
+
+        monkeypatch.setenv("LOKKI_GZIP_LEVEL", "6")
+        assert _gzip_level_from_env() == 6
+
+    @pytest.mark.parametrize("value", ["fast", "12", "-1"])
+    def test_invalid_values_fall_back(
+        self, monkeypatch: pytest.MonkeyPatch, value: str
+    ) -> None:
+        """Test invalid LOKKI_GZIP_LEVEL values fall back to level 1."""
+        from lokki.store.utils import _gzip_level_from_env
+
+        monkeypatch.setenv("LOKKI_GZIP_LEVEL", value)
+        assert _gzip_level_from_env() == 1
+
+
+class TestGzipPickle:
+    """Tests for the streaming gzip pickle helpers."""
+
+    def test_round_trip(self) -> None:
+        """Test objects survive a dump and load through gzip."""
+        import gzip
+        import io
+        import pickle
+
+        from lokki.store.utils import _dumps_gzip_pickle, _load_gzip_pickle
+
+        obj = {"items": list(range(1000)), "name": "test"}
+        data = _dumps_gzip_pickle(obj)
+
+        assert pickle.loads(gzip.decompress(data)) == obj
+        assert _load_gzip_pickle(io.BytesIO(data)) == obj
+
+
+class TestDumpsManifest:
+    """Tests for manifest JSON encoding."""
+
+    def test_compact_and_round_trips(self) -> None:
+        """Test manifests are written without padding and decode unchanged."""
+        import json
+        from datetime import date
+
+        from lokki.store.utils import _dumps_manifest
+
+        items = [{"id": 1, "day": date(2024, 1, 2)}, [1, 2]]
+        data = _dumps_manifest(items)
+
+        assert data == '[{"id":1,"day":"2024-01-02"},[1,2]]'
+        assert json.loads(data) == [{"id": 1, "day": "2024-01-02"}, [1, 2]]
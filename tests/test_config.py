@@ -395,6 +395,32 @@ class TestIncludeConfig:
         assert config.include.paths == []
 
 
+class TestLocalConfig:
+    """Tests for LocalConfig dataclass."""
+
+    def test_default_values(self) -> None:
+        """Test LocalConfig default values."""
+        from lokki.config import LocalConfig
+
+        config = LocalConfig()
+        assert config.store_type == "local"
+        assert config.max_workers is None
+
+    def test_from_dict_max_workers(self) -> None:
+        """Test LocalConfig max_workers from dict."""
+        from lokki.config import LokkiConfig
+
+        config = LokkiConfig.from_dict({"local": {"max_workers": 64}})
+        assert config.local_cfg.max_workers == 64
+
+    def test_invalid_max_workers(self) -> None:
+        """Test LocalConfig rejects non-positive max_workers."""
+        from lokki.config import LocalConfig
+
+        with pytest.raises(ValueError, match="max_workers must be positive"):
+            LocalConfig(max_workers=0)
+
+
 class TestSecretsConfig:
     """Tests for SecretsConfig dataclass."""
 
@@ -117,6 +117,17 @@ class TestStepNode:
         assert first._next is second
         assert second._next is third
 
+    def test_step_node_uses_slots(self) -> None:
+        """Test that StepNode instances have no per-instance __dict__."""
+
+        @step
+        def my_step() -> str:
+            return "result"
+
+        assert not hasattr(my_step, "__dict__")
+        with pytest.raises(AttributeError):
+            my_step.unknown_attribute = 1  # type: ignore[attr-defined]
+
 
 class TestMapBlock:
     """Tests for MapBlock class."""
@@ -282,6 +293,21 @@ class TestMapBlock:
 
         assert block.concurrency_limit is None
 
+    def test_map_block_uses_slots(self) -> None:
+        """Test that MapBlock instances have no per-instance __dict__."""
+
+        @step
+        def source() -> list[str]:
+            return ["a"]
+
+        @step
+        def process(x: str) -> str:
+            return x
+
+        block = source.map(process)
+
+        assert not hasattr(block, "__dict__")
+
 
 class TestFlowDecorator:
     """Tests for @flow decorator."""
@@ -330,6 +356,28 @@ class TestFlowDecorator:
         assert hasattr(my_flow, "_is_flow")
         assert my_flow._is_flow is True  # type: ignore[attr-defined]
 
+    def test_flow_rebinds_step_arguments_on_each_call(self) -> None:
+        """Test that calling a flow again rebuilds the graph with its own args."""
+
+        @step
+        def first(n: int) -> int:
+            return n
+
+        @step
+        def second(n: int) -> int:
+            return n * 10
+
+        @flow
+        def arg_flow(n: int) -> StepNode:
+            return first(n).next(second)
+
+        from lokki.runtime.local import LocalRunner
+
+        runner = LocalRunner(store_type="memory")
+        assert runner.run(arg_flow(1)) == 10
+        assert runner.run(arg_flow(2)) == 20
+        assert runner.run(arg_flow(1)) == 10
+
 
 class TestFlowGraph:
     """Tests for FlowGraph class."""
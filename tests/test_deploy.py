@@ -1,14 +1,41 @@
 """Unit tests for deploy module."""
 
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
 import tempfile
+import threading
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import boto3
 import pytest
+from botocore.exceptions import WaiterError
 from moto import mock_aws
 
-from lokki.cli.deploy import Deployer, DeployError, DockerNotAvailableError
+from lokki.cli.deploy import (
+    Deployer,
+    DeployError,
+    DockerNotAvailableError,
+    _ping_docker_socket,
+    _run_streaming,
+    _stack_digest,
+    _stack_parameters,
+)
+
+
+@pytest.fixture(autouse=True)
+def ecr_login_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep ECR login cache files out of the real home directory."""
+    cache_dir = tmp_path / "ecr-cache"
+    monkeypatch.setattr("lokki.cli.deploy.ECR_LOGIN_CACHE_DIR", cache_dir)
+    return cache_dir
 
 
 class TestDeployerInit:
@@ -111,10 +138,10 @@ class TestDeployerPushImages:
                 deployer._push_images("local", build_dir)
 
     @mock_aws
-    @patch("lokki.cli.deploy.subprocess.run")
+    @patch("lokki.cli.deploy._run_streaming")
     def test_push_images_local_success(self, mock_subprocess: MagicMock) -> None:
         """Test successful local Docker image push."""
-        mock_subprocess.return_value = MagicMock(returncode=0, stderr="")
+        mock_subprocess.return_value = (0, "")
 
         deployer = Deployer(
             stack_name="test-stack",
@@ -136,7 +163,7 @@ class TestDeployerPushImages:
             assert mock_subprocess.call_count >= 1
 
     @mock_aws
-    @patch("lokki.cli.deploy.subprocess.run")
+    @patch("lokki.cli.deploy._run_streaming")
     def test_push_images_local_docker_not_available(
         self, mock_subprocess: MagicMock
     ) -> None:
@@ -162,10 +189,14 @@ class TestDeployerPushImages:
             with pytest.raises(DockerNotAvailableError):
                 deployer._push_images("registry:ci", build_dir)
 
+    @patch("lokki.cli.deploy._run_streaming")
     @patch("lokki.cli.deploy.subprocess.run")
-    def test_push_images_ecr_success(self, mock_subprocess: MagicMock) -> None:
+    def test_push_images_ecr_success(
+        self, mock_subprocess: MagicMock, mock_streaming: MagicMock
+    ) -> None:
         """Test successful ECR Docker image push."""
         mock_subprocess.return_value = MagicMock(returncode=0, stderr="")
+        mock_streaming.return_value = (0, "")
 
         deployer = Deployer(
             stack_name="test-stack",
@@ -173,6 +204,7 @@ class TestDeployerPushImages:
             image_tag="latest",
             package_type="image",
         )
+        deployer._buildx_available = False
 
         with tempfile.TemporaryDirectory() as tmpdir:
             build_dir = Path(tmpdir) / "build"
@@ -183,6 +215,7 @@ class TestDeployerPushImages:
 
             # Push to ECR (non-local) - needs mocked ECR client
             with patch.object(deployer, "ecr_client") as mock_ecr:
+                mock_ecr.batch_get_image.return_value = {"images": []}
                 # ECR returns bytes for authorizationToken
                 mock_ecr.get_authorization_token.return_value = {
                     "authorizationData": [
@@ -196,8 +229,216 @@ class TestDeployerPushImages:
                     "123456789.dkr.ecr.us-east-1.amazonaws.com/test", build_dir
                 )
 
-            # Verify docker commands were called
-            assert mock_subprocess.call_count >= 2
+            # Verify docker login, build and push were called
+            assert mock_subprocess.call_count == 1
+            assert mock_streaming.call_count == 2
+
+    @patch("lokki.cli.deploy._run_streaming")
+    @patch("lokki.cli.deploy.subprocess.run")
+    def test_push_images_ecr_buildx(
+        self, mock_subprocess: MagicMock, mock_streaming: MagicMock
+    ) -> None:
+        """Test buildx builds and pushes in one pass with a registry cache."""
+        mock_subprocess.return_value = MagicMock(returncode=0, stderr="")
+        mock_streaming.return_value = (0, "")
+        repo = "123456789.dkr.ecr.us-east-1.amazonaws.com/test"
+
+        deployer = Deployer(stack_name="test-stack", image_tag="v1")
+        deployer._buildx_available = True
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_dir = Path(tmpdir)
+            (build_dir / "lambdas").mkdir()
+            (build_dir / "lambdas" / "Dockerfile").write_text("FROM python:3.13")
+
+            with patch.object(deployer, "ecr_client") as mock_ecr:
+                mock_ecr.batch_get_image.return_value = {"images": []}
+                mock_ecr.get_authorization_token.return_value = {
+                    "authorizationData": [
+                        {
+                            "authorizationToken": b"user:pass",
+                            "proxyEndpoint": f"https://{repo.split('/')[0]}",
+                        }
+                    ]
+                }
+                deployer._push_images(repo, build_dir)
+
+        mock_streaming.assert_called_once()
+        cmd = mock_streaming.call_args.args[0]
+        assert cmd[:4] == ["docker", "buildx", "build", "--push"]
+        assert f"type=registry,ref={repo}/lokki:buildcache" in cmd
+        assert f"{repo}/lokki:v1" in cmd
+        assert any(
+            arg.endswith(",mode=max,image-manifest=true,oci-mediatypes=true")
+            for arg in cmd
+        )
+
+    @pytest.mark.parametrize(
+        ("stdout", "expected"),
+        [
+            ("Name:   builder\nDriver: docker-container\n", True),
+            ("Name:   default\nDriver: docker\n", False),
+            ("", False),
+        ],
+    )
+    @patch("lokki.cli.deploy.subprocess.run")
+    def test_buildx_available_checks_driver(
+        self, mock_subprocess: MagicMock, stdout: str, expected: bool
+    ) -> None:
+        """Test buildx is only used with a driver that can export cache."""
+        mock_subprocess.return_value = MagicMock(returncode=0, stdout=stdout)
+
+        assert Deployer(stack_name="test-stack")._buildx_available is expected
+
+    @patch("lokki.cli.deploy.subprocess.run", side_effect=FileNotFoundError)
+    def test_buildx_unavailable_without_docker(self, _: MagicMock) -> None:
+        """Test missing docker disables the buildx path."""
+        assert Deployer(stack_name="test-stack")._buildx_available is False
+
+    @mock_aws
+    @patch("lokki.cli.deploy._run_streaming")
+    def test_push_images_build_failure_reports_output(
+        self, mock_streaming: MagicMock
+    ) -> None:
+        """Test that a failed build includes the captured output tail."""
+        mock_streaming.return_value = (1, "step 3/5 failed\n")
+
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_dir = Path(tmpdir) / "build"
+            lambdas_dir = build_dir / "lambdas"
+            lambdas_dir.mkdir(parents=True)
+            (lambdas_dir / "Dockerfile").write_text("FROM python:3.13")
+
+            with pytest.raises(DeployError, match="step 3/5 failed"):
+                deployer._push_images("registry:ci", build_dir)
+
+    @patch("lokki.cli.deploy._run_streaming")
+    def test_build_image_uses_inline_cache(self, mock_streaming: MagicMock) -> None:
+        """Test that the build reuses the registry layer cache without a pull."""
+        mock_streaming.return_value = (0, "")
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        image_uri = "localhost:5000/lokki:latest"
+
+        deployer._build_image(Path("."), image_uri)
+
+        (build_call,) = mock_streaming.call_args_list
+        build_cmd = build_call.args[0]
+        assert "BUILDKIT_INLINE_CACHE=1" in build_cmd
+        assert build_cmd[build_cmd.index("--cache-from") + 1] == image_uri
+        assert build_call.kwargs["env"]["DOCKER_BUILDKIT"] == "1"
+
+    @patch("lokki.cli.deploy._run_streaming")
+    def test_push_images_skips_unchanged_context(
+        self, mock_streaming: MagicMock
+    ) -> None:
+        """Test that an unchanged image context is not rebuilt or pushed."""
+        mock_streaming.return_value = (0, "")
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_dir = Path(tmpdir) / "build"
+            lambdas_dir = build_dir / "lambdas"
+            lambdas_dir.mkdir(parents=True)
+            (lambdas_dir / "Dockerfile").write_text("FROM python:3.13")
+
+            deployer._push_images("registry:ci", build_dir)
+            calls_after_first_push = mock_streaming.call_count
+            deployer._push_images("registry:ci", build_dir)
+
+            assert calls_after_first_push == 2
+            assert mock_streaming.call_count == calls_after_first_push
+
+    @patch("lokki.cli.deploy._run_streaming")
+    def test_push_images_rebuilds_changed_context(
+        self, mock_streaming: MagicMock
+    ) -> None:
+        """Test that changed context files or a new tag trigger a rebuild."""
+        mock_streaming.return_value = (0, "")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_dir = Path(tmpdir) / "build"
+            lambdas_dir = build_dir / "lambdas"
+            lambdas_dir.mkdir(parents=True)
+            (lambdas_dir / "Dockerfile").write_text("FROM python:3.13")
+
+            Deployer(stack_name="s", image_tag="v1")._push_images(
+                "registry:ci", build_dir
+            )
+            (lambdas_dir / "handler.py").write_text("print('changed')")
+            Deployer(stack_name="s", image_tag="v1")._push_images(
+                "registry:ci", build_dir
+            )
+            Deployer(stack_name="s", image_tag="v2")._push_images(
+                "registry:ci", build_dir
+            )
+
+            assert mock_streaming.call_count == 6
+
+    @patch("lokki.cli.deploy._run_streaming")
+    def test_push_images_failed_push_not_recorded(
+        self, mock_streaming: MagicMock
+    ) -> None:
+        """Test that a failed push does not mark the context as pushed."""
+        mock_streaming.side_effect = [(0, ""), (1, "denied")]
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_dir = Path(tmpdir) / "build"
+            lambdas_dir = build_dir / "lambdas"
+            lambdas_dir.mkdir(parents=True)
+            (lambdas_dir / "Dockerfile").write_text("FROM python:3.13")
+
+            with pytest.raises(DeployError, match="Docker push failed"):
+                deployer._push_images("registry:ci", build_dir)
+
+            assert not (build_dir / ".last_pushed_digest").exists()
+
+
+class TestRunStreaming:
+    """Tests for streaming subprocess execution."""
+
+    def test_returns_output_tail(self) -> None:
+        """Test that only the last lines of output are kept."""
+        script = "for i in range(500): print(i)"
+        returncode, output = _run_streaming([sys.executable, "-c", script])
+
+        lines = output.splitlines()
+        assert returncode == 0
+        assert len(lines) == 200
+        assert lines[-1] == "499"
+
+    def test_merges_stderr(self) -> None:
+        """Test that stderr is included in the captured output."""
+        script = "import sys; sys.stderr.write('boom\\n'); sys.exit(3)"
+        returncode, output = _run_streaming([sys.executable, "-c", script])
+
+        assert returncode == 3
+        assert "boom" in output
+
+    def test_idle_timeout_kills_silent_process(self) -> None:
+        """Test that a command producing no output is killed."""
+        with pytest.raises(subprocess.TimeoutExpired):
+            _run_streaming(
+                [sys.executable, "-c", "import time; time.sleep(30)"],
+                idle_timeout=0.5,
+            )
+
+    def test_output_resets_idle_timeout(self) -> None:
+        """Test that a command outlives the idle timeout while it prints."""
+        script = (
+            "import time\n"
+            "for i in range(6):\n"
+            "    print(i, flush=True)\n"
+            "    time.sleep(0.2)\n"
+        )
+        returncode, output = _run_streaming(
+            [sys.executable, "-c", script], idle_timeout=0.6
+        )
+
+        assert returncode == 0
+        assert output.splitlines()[-1] == "5"
 
 
 class TestDeployerClients:
@@ -216,6 +457,18 @@ class TestDeployerClients:
         assert deployer.ecr_client is not None
         assert deployer.sts_client is not None
 
+    def test_clients_created_lazily(self) -> None:
+        """Test that boto3 clients are only created on first access."""
+        with patch("lokki.cli.deploy.get_ecr_client") as mock_get_ecr:
+            deployer = Deployer(stack_name="test-stack", region="eu-west-1")
+
+            mock_get_ecr.assert_not_called()
+            first = deployer.ecr_client
+            second = deployer.ecr_client
+
+        mock_get_ecr.assert_called_once_with("eu-west-1")
+        assert first is second
+
     @mock_aws
     def test_account_id_property(self) -> None:
         """Test that account_id is fetched correctly."""
@@ -341,6 +594,58 @@ Resources:
             assert len(stacks["Stacks"]) == 1
 
 
+class TestDeployerDescribeStack:
+    """Tests for the stack existence lookup."""
+
+    @mock_aws
+    def test_describe_stack_missing_returns_none(self) -> None:
+        """Test that a missing stack is reported as None."""
+        deployer = Deployer(stack_name="missing-stack", region="us-east-1")
+
+        assert deployer._describe_stack() is None
+
+    @mock_aws
+    def test_describe_stack_existing(self) -> None:
+        """Test that an existing stack description is returned."""
+        cf_client = boto3.client("cloudformation", region_name="us-east-1")
+        cf_client.create_stack(
+            StackName="test-stack",
+            TemplateBody="AWSTemplateFormatVersion: '2010-09-09'\nResources: {}",
+        )
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+
+        stack = deployer._describe_stack()
+
+        assert stack is not None
+        assert stack["StackName"] == "test-stack"
+
+    @mock_aws
+    def test_deploy_uses_prefetched_stack_lookup(self) -> None:
+        """Test that deploy() hands the background stack lookup to boto3 deploy."""
+        deployer = Deployer(
+            stack_name="test-stack",
+            region="us-east-1",
+            endpoint="http://localhost:4566",
+            package_type="zip",
+        )
+
+        with (
+            patch.object(deployer, "_upload_lambda_zip") as mock_upload,
+            patch.object(deployer, "_deploy_stack") as mock_deploy_stack,
+        ):
+            deployer.deploy(
+                flow_name="test-flow",
+                artifact_bucket="test-bucket",
+                image_repository="test-repo",
+                build_dir=Path("build"),
+                package_type="zip",
+            )
+
+        mock_upload.assert_called_once()
+        stack_lookup = mock_deploy_stack.call_args.kwargs["stack_lookup"]
+        assert stack_lookup.result() is None
+
+
 class TestDeployerValidateCredentials:
     """Tests for credential validation."""
 
@@ -372,6 +677,72 @@ class TestDeployerValidateCredentials:
                 deployer._validate_credentials()
 
 
+class TestPingDockerSocket:
+    """Tests for the Docker daemon socket ping."""
+
+    @pytest.fixture
+    def docker_socket(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+        """Serve one canned HTTP reply on a UNIX socket set as DOCKER_HOST."""
+        sock_dir = tempfile.mkdtemp()
+        path = os.path.join(sock_dir, "docker.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{path}")
+        monkeypatch.delenv("DOCKER_CONTEXT", raising=False)
+
+        def serve(reply: bytes) -> None:
+            def handle() -> None:
+                conn, _ = server.accept()
+                with conn:
+                    conn.recv(1024)
+                    conn.sendall(reply)
+
+            threading.Thread(target=handle, daemon=True).start()
+
+        yield serve
+        server.close()
+        shutil.rmtree(sock_dir, ignore_errors=True)
+
+    def test_ping_ok(self, docker_socket: Any) -> None:
+        """Test a 200 reply from the daemon counts as running."""
+        docker_socket(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nOK")
+
+        assert _ping_docker_socket() is True
+
+    def test_ping_error_status(self, docker_socket: Any) -> None:
+        """Test a non-200 reply is not treated as running."""
+        docker_socket(b"HTTP/1.1 500 Internal Server Error\r\n\r\n")
+
+        assert _ping_docker_socket() is False
+
+    def test_ping_missing_socket(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a missing socket falls back to the CLI check."""
+        monkeypatch.setenv("DOCKER_HOST", "unix:///nonexistent/docker.sock")
+
+        assert _ping_docker_socket() is False
+
+    def test_ping_skips_tcp_host(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test TCP daemons are left to the CLI check."""
+        monkeypatch.setenv("DOCKER_HOST", "tcp://127.0.0.1:2375")
+
+        assert _ping_docker_socket() is False
+
+    @mock_aws
+    def test_validate_credentials_uses_ping(self, docker_socket: Any) -> None:
+        """Test that a successful ping skips the docker info subprocess."""
+        docker_socket(b"HTTP/1.1 200 OK\r\n\r\nOK")
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+
+        with (
+            patch("lokki.cli.deploy.shutil.which", return_value="/usr/bin/docker"),
+            patch("lokki.cli.deploy.subprocess.run") as mock_run,
+        ):
+            deployer._validate_credentials()
+
+        mock_run.assert_not_called()
+
+
 class TestDeployerBoto3:
     """Tests for boto3 deployment."""
 
@@ -428,7 +799,10 @@ class TestDeployerWaitForStack:
             TemplateBody="AWSTemplateFormatVersion: '2010-09-09'\nResources: {}",
         )
 
-        deployer._wait_for_stack()
+        stack = deployer._wait_for_stack()
+
+        assert stack["StackName"] == "test-stack"
+        assert stack["StackStatus"] == "CREATE_COMPLETE"
 
     @mock_aws
     def test_wait_for_stack_failure_with_reason(self) -> None:
@@ -493,3 +867,591 @@ class TestDeployerWaitForStack:
             mock_cf.describe_stack_events.assert_called_once_with(
                 StackName="test-stack-fail", MaxItems=10
             )
+
+    def test_wait_for_stack_uses_update_waiter(self) -> None:
+        """Test that the matching CloudFormation waiter is used."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+
+        with patch.object(deployer, "cf_client") as mock_cf:
+            mock_cf.describe_stacks.return_value = {
+                "Stacks": [
+                    {"StackName": "test-stack", "StackStatus": "UPDATE_COMPLETE"}
+                ]
+            }
+
+            stack = deployer._wait_for_stack(is_update=True)
+
+        mock_cf.get_waiter.assert_called_once_with("stack_update_complete")
+        wait_kwargs = mock_cf.get_waiter.return_value.wait.call_args.kwargs
+        assert wait_kwargs["StackName"] == "test-stack"
+        assert stack["StackStatus"] == "UPDATE_COMPLETE"
+
+    def test_wait_for_stack_waiter_failure(self) -> None:
+        """Test that a waiter failure reports the terminal stack status."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        last_response = {
+            "Stacks": [
+                {
+                    "StackName": "test-stack",
+                    "StackStatus": "ROLLBACK_COMPLETE",
+                    "StackStatusReason": "Role does not exist",
+                }
+            ]
+        }
+
+        with patch.object(deployer, "cf_client") as mock_cf:
+            mock_cf.get_waiter.return_value.wait.side_effect = WaiterError(
+                name="StackCreateComplete",
+                reason="terminal failure state",
+                last_response=last_response,
+            )
+
+            with pytest.raises(
+                DeployError, match="ROLLBACK_COMPLETE: Role does not exist"
+            ):
+                deployer._wait_for_stack()
+
+        mock_cf.describe_stacks.assert_not_called()
+
+    def test_wait_for_stack_waiter_timeout(self) -> None:
+        """Test that exhausting the waiter attempts is reported as a timeout."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        last_response = {
+            "Stacks": [{"StackName": "test-stack", "StackStatus": "CREATE_IN_PROGRESS"}]
+        }
+
+        with patch.object(deployer, "cf_client") as mock_cf:
+            mock_cf.get_waiter.return_value.wait.side_effect = WaiterError(
+                name="StackCreateComplete",
+                reason="Max attempts exceeded",
+                last_response=last_response,
+            )
+
+            with pytest.raises(DeployError, match="Timed out waiting"):
+                deployer._wait_for_stack()
+
+
+class TestDeployerStackOutputs:
+    """Tests for reading stack outputs after deployment."""
+
+    def test_deploy_reuses_final_stack_for_outputs(self) -> None:
+        """Test that outputs come from the waited-on stack without a re-describe."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        final_stack = {
+            "StackName": "test-stack",
+            "StackStatus": "CREATE_COMPLETE",
+            "Outputs": [{"OutputKey": "StateMachineArn", "OutputValue": "arn:sm"}],
+        }
+
+        with (
+            patch.object(deployer, "cf_client") as mock_cf,
+            patch.object(deployer, "_describe_stack", return_value=None),
+            patch.object(deployer, "_register_flow_metadata") as mock_register,
+        ):
+            mock_cf.describe_stacks.return_value = {"Stacks": [final_stack]}
+
+            deployer._deploy_with_boto3(
+                template_body="{}",
+                flow_name="test-flow",
+                artifact_bucket="test-bucket",
+                image_repository="test-repo",
+                aws_endpoint="",
+            )
+
+        assert mock_cf.describe_stacks.call_count == 1
+        mock_register.assert_called_once_with("test-flow", final_stack["Outputs"])
+
+
+class TestDeployerSkipUnchangedStack:
+    """Tests for skipping stack updates when nothing changed."""
+
+    def _deploy(self, deployer: Deployer, existing: dict[str, Any]) -> MagicMock:
+        with (
+            patch.object(deployer, "cf_client") as mock_cf,
+            patch.object(deployer, "_describe_stack", return_value=existing),
+            patch.object(deployer, "_register_flow_metadata"),
+        ):
+            mock_cf.describe_stacks.return_value = {
+                "Stacks": [{**existing, "StackStatus": "UPDATE_COMPLETE"}]
+            }
+            mock_cf.describe_change_set.return_value = {"Changes": []}
+            deployer._deploy_with_boto3(
+                template_body="{}",
+                flow_name="test-flow",
+                artifact_bucket="test-bucket",
+                image_repository="test-repo",
+                aws_endpoint="",
+            )
+        return mock_cf
+
+    def _digest(self, image_tag: str = "latest") -> str:
+        return _stack_digest(
+            "{}",
+            _stack_parameters(("test-flow", "test-bucket", "test-repo", image_tag, "")),
+        )
+
+    def test_matching_digest_skips_update(self) -> None:
+        """Test that an unchanged template and parameters skip the update."""
+        deployer = Deployer(stack_name="test-stack")
+        existing = {
+            "StackStatus": "UPDATE_COMPLETE",
+            "Tags": [{"Key": "lokki:template-sha256", "Value": self._digest()}],
+        }
+
+        mock_cf = self._deploy(deployer, existing)
+
+        mock_cf.create_change_set.assert_not_called()
+        mock_cf.execute_change_set.assert_not_called()
+
+    def test_skipped_large_template_makes_no_s3_calls(self) -> None:
+        """Test that an unchanged oversized template is not checked in S3."""
+        deployer = Deployer(stack_name="test-stack")
+        template = "AWSTemplateFormatVersion: '2010-09-09'\n" + "#" * 60_000 + "\n"
+        digest = _stack_digest(
+            template,
+            _stack_parameters(("test-flow", "test-bucket", "test-repo", "latest", "")),
+        )
+        existing = {
+            "StackStatus": "UPDATE_COMPLETE",
+            "Tags": [{"Key": "lokki:template-sha256", "Value": digest}],
+        }
+
+        with (
+            patch.object(deployer, "cf_client") as mock_cf,
+            patch.object(deployer, "s3_client") as mock_s3,
+            patch.object(deployer, "_describe_stack", return_value=existing),
+            patch.object(deployer, "_register_flow_metadata"),
+        ):
+            deployer._deploy_with_boto3(
+                template_body=template,
+                flow_name="test-flow",
+                artifact_bucket="test-bucket",
+                image_repository="test-repo",
+                aws_endpoint="",
+            )
+
+        assert mock_s3.method_calls == []
+        mock_cf.create_change_set.assert_not_called()
+
+    def test_changed_parameters_update_and_keep_tags(self) -> None:
+        """Test that a new image tag updates the stack, preserving other tags."""
+        deployer = Deployer(stack_name="test-stack", image_tag="v2")
+        existing = {
+            "StackStatus": "UPDATE_COMPLETE",
+            "Tags": [
+                {"Key": "team", "Value": "data"},
+                {"Key": "lokki:template-sha256", "Value": self._digest("v1")},
+            ],
+        }
+
+        mock_cf = self._deploy(deployer, existing)
+
+        tags = mock_cf.create_change_set.call_args.kwargs["Tags"]
+        mock_cf.execute_change_set.assert_called_once()
+        assert {"Key": "team", "Value": "data"} in tags
+        assert {"Key": "lokki:template-sha256", "Value": self._digest("v2")} in tags
+
+    def test_failed_stack_is_updated_despite_digest(self) -> None:
+        """Test that a stack left in a rollback state is not skipped."""
+        deployer = Deployer(stack_name="test-stack")
+        existing = {
+            "StackStatus": "UPDATE_ROLLBACK_COMPLETE",
+            "Tags": [{"Key": "lokki:template-sha256", "Value": self._digest()}],
+        }
+
+        mock_cf = self._deploy(deployer, existing)
+
+        mock_cf.execute_change_set.assert_called_once()
+
+
+class TestDeployerChangeSets:
+    """Tests for updating existing stacks through change sets."""
+
+    def test_empty_change_set_is_deleted(self) -> None:
+        """Test that a change set without changes is deleted, not executed."""
+        deployer = Deployer(stack_name="test-stack")
+        no_changes = WaiterError(
+            name="ChangeSetCreateComplete",
+            reason="Waiter encountered a terminal failure state",
+            last_response={
+                "Status": "FAILED",
+                "StatusReason": "The submitted information didn't contain changes.",
+            },
+        )
+
+        with patch.object(deployer, "cf_client") as mock_cf:
+            mock_cf.get_waiter.return_value.wait.side_effect = no_changes
+            result = deployer._create_change_set({"TemplateBody": "{}"}, [], [])
+
+        assert result is None
+        mock_cf.delete_change_set.assert_called_once()
+        mock_cf.execute_change_set.assert_not_called()
+
+    def test_failed_change_set_raises(self) -> None:
+        """Test that a change set failing for another reason is an error."""
+        deployer = Deployer(stack_name="test-stack")
+        failed = WaiterError(
+            name="ChangeSetCreateComplete",
+            reason="Waiter encountered a terminal failure state",
+            last_response={"Status": "FAILED", "StatusReason": "Template error"},
+        )
+
+        with patch.object(deployer, "cf_client") as mock_cf:
+            mock_cf.get_waiter.return_value.wait.side_effect = failed
+            with pytest.raises(DeployError, match="Template error"):
+                deployer._create_change_set({"TemplateBody": "{}"}, [], [])
+
+        mock_cf.delete_change_set.assert_not_called()
+
+    @mock_aws
+    def test_update_executes_change_set(self) -> None:
+        """Test that a changed stack is updated by executing a change set."""
+        template = (
+            "AWSTemplateFormatVersion: '2010-09-09'\n"
+            "Parameters:\n"
+            "  FlowName: {Type: String}\n"
+            "  S3Bucket: {Type: String}\n"
+            "  ECRRepoPrefix: {Type: String}\n"
+            "  ImageTag: {Type: String}\n"
+            "  AWSEndpoint: {Type: String}\n"
+            "Resources:\n"
+            "  Topic:\n"
+            "    Type: AWS::SNS::Topic\n"
+        )
+
+        for tag in ("v1", "v2"):
+            deployer = Deployer(stack_name="cs-stack", image_tag=tag)
+            with patch.object(deployer, "_register_flow_metadata"):
+                deployer._deploy_with_boto3(
+                    template_body=template,
+                    flow_name="test-flow",
+                    artifact_bucket="test-bucket",
+                    image_repository="test-repo",
+                    aws_endpoint="",
+                )
+
+        cf = boto3.client("cloudformation", region_name="us-east-1")
+        stack = cf.describe_stacks(StackName="cs-stack")["Stacks"][0]
+        params = {p["ParameterKey"]: p["ParameterValue"] for p in stack["Parameters"]}
+        assert params["ImageTag"] == "v2"
+
+
+class TestStackParameters:
+    """Tests for CloudFormation parameter construction."""
+
+    def test_stack_parameters_in_key_order(self) -> None:
+        """Test that values are paired with parameter keys in order."""
+        params = _stack_parameters(("flow", "bucket", "prefix", "v1", ""))
+
+        assert params == [
+            {"ParameterKey": "FlowName", "ParameterValue": "flow"},
+            {"ParameterKey": "S3Bucket", "ParameterValue": "bucket"},
+            {"ParameterKey": "ECRRepoPrefix", "ParameterValue": "prefix"},
+            {"ParameterKey": "ImageTag", "ParameterValue": "v1"},
+            {"ParameterKey": "AWSEndpoint", "ParameterValue": ""},
+        ]
+
+    def test_stack_parameters_rejects_wrong_length(self) -> None:
+        """Test that a value count mismatch is an error."""
+        with pytest.raises(ValueError):
+            _stack_parameters(("flow", "bucket"))
+
+
+class TestDeployerEcrLoginCache:
+    """Tests for skipping docker login while a cached ECR login is valid."""
+
+    HOST = "123456789.dkr.ecr.us-east-1.amazonaws.com"
+
+    def _login(self, deployer: Deployer, expires_at: datetime) -> MagicMock:
+        with (
+            patch("lokki.cli.deploy.subprocess.run") as mock_run,
+            patch.object(deployer, "ecr_client") as mock_ecr,
+        ):
+            mock_run.return_value = MagicMock(returncode=0, stderr="")
+            mock_ecr.get_authorization_token.return_value = {
+                "authorizationData": [
+                    {
+                        "authorizationToken": b"user:pass",
+                        "proxyEndpoint": f"https://{self.HOST}",
+                        "expiresAt": expires_at,
+                    }
+                ]
+            }
+            deployer._login_to_ecr(self.HOST)
+        return mock_run
+
+    def test_login_writes_cache_without_token(self, ecr_login_cache_dir: Path) -> None:
+        """Test a fresh login records its expiry but not the credential."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        expires_at = datetime.now(UTC) + timedelta(hours=12)
+
+        mock_run = self._login(deployer, expires_at)
+
+        assert mock_run.call_count == 1
+        cache_file = ecr_login_cache_dir / f"ecr-{self.HOST}.json"
+        data = json.loads(cache_file.read_text())
+        assert datetime.fromisoformat(data["expiresAt"]) == expires_at
+        assert "pass" not in cache_file.read_text()
+        if sys.platform != "win32":
+            assert cache_file.stat().st_mode & 0o777 == 0o600
+
+    def test_valid_cache_skips_login(self) -> None:
+        """Test docker login is skipped while the cached token is valid."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        self._login(deployer, datetime.now(UTC) + timedelta(hours=12))
+
+        mock_run = self._login(deployer, datetime.now(UTC) + timedelta(hours=12))
+
+        mock_run.assert_not_called()
+
+    def test_expiring_cache_logs_in_again(self) -> None:
+        """Test a token close to expiry triggers a new docker login."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        self._login(deployer, datetime.now(UTC) + timedelta(minutes=2))
+
+        mock_run = self._login(deployer, datetime.now(UTC) + timedelta(hours=12))
+
+        assert mock_run.call_count == 1
+
+    def test_failed_login_is_not_cached(self, ecr_login_cache_dir: Path) -> None:
+        """Test a failed docker login leaves no cache entry behind."""
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        with (
+            patch("lokki.cli.deploy.subprocess.run") as mock_run,
+            patch.object(deployer, "ecr_client") as mock_ecr,
+        ):
+            mock_run.return_value = MagicMock(returncode=1, stderr="denied")
+            mock_ecr.get_authorization_token.return_value = {
+                "authorizationData": [
+                    {
+                        "authorizationToken": b"user:pass",
+                        "proxyEndpoint": f"https://{self.HOST}",
+                        "expiresAt": datetime.now(UTC) + timedelta(hours=12),
+                    }
+                ]
+            }
+            with pytest.raises(DeployError, match="denied"):
+                deployer._login_to_ecr(self.HOST)
+
+        assert not (ecr_login_cache_dir / f"ecr-{self.HOST}.json").exists()
+
+    @patch("lokki.cli.deploy._run_streaming")
+    def test_failed_push_after_cached_login_logs_in_again(
+        self, mock_streaming: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test a stale cached login is replaced when the push is rejected."""
+        (tmp_path / "lambdas").mkdir()
+        (tmp_path / "lambdas" / "Dockerfile").write_text("FROM python:3.13")
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        deployer._buildx_available = True
+        # A previous deploy cached the login; docker has since logged out
+        self._login(deployer, datetime.now(UTC) + timedelta(hours=12))
+        mock_streaming.side_effect = [
+            (1, "no basic auth credentials"),
+            (0, ""),
+        ]
+
+        with (
+            patch("lokki.cli.deploy.subprocess.run") as mock_run,
+            patch.object(deployer, "ecr_client") as mock_ecr,
+        ):
+            mock_run.return_value = MagicMock(returncode=0, stderr="")
+            mock_ecr.get_authorization_token.return_value = {
+                "authorizationData": [
+                    {
+                        "authorizationToken": b"user:pass",
+                        "proxyEndpoint": f"https://{self.HOST}",
+                        "expiresAt": datetime.now(UTC) + timedelta(hours=12),
+                    }
+                ]
+            }
+            mock_ecr.batch_get_image.return_value = {"images": []}
+            deployer._push_images(f"{self.HOST}/flows", tmp_path)
+
+        assert mock_streaming.call_count == 2
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args[0][:2] == ["docker", "login"]
+
+    @patch("lokki.cli.deploy._run_streaming", return_value=(1, "build broke"))
+    def test_failed_push_after_fresh_login_is_not_retried(
+        self, mock_streaming: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test a push failure right after a real login is reported as is."""
+        (tmp_path / "lambdas").mkdir()
+        (tmp_path / "lambdas" / "Dockerfile").write_text("FROM python:3.13")
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+        deployer._buildx_available = True
+
+        with (
+            patch.object(deployer, "_login_to_ecr", return_value=False) as login,
+            patch.object(deployer, "_tag_ecr_image", return_value=False),
+            pytest.raises(DeployError, match="build broke"),
+        ):
+            deployer._push_images(f"{self.HOST}/flows", tmp_path)
+
+        login.assert_called_once()
+        mock_streaming.assert_called_once()
+
+
+class TestDeployerEcrRetag:
+    """Tests for reusing an ECR image built from an identical context."""
+
+    REPO = "123456789012.dkr.ecr.us-east-1.amazonaws.com/flows"
+    MANIFEST = json.dumps(
+        {
+            "schemaVersion": 2,
+            "mediaType": "application/vnd.docker.distribution.manifest.v2+json",
+            "config": {"digest": "sha256:" + "a" * 64, "size": 1},
+            "layers": [],
+        }
+    )
+
+    def _build_dir(self, root: Path) -> Path:
+        (root / "lambdas").mkdir()
+        (root / "lambdas" / "Dockerfile").write_text("FROM python:3.13")
+        return root
+
+    @mock_aws
+    @patch("lokki.cli.deploy._run_streaming")
+    def test_existing_content_tag_is_retagged(
+        self, mock_streaming: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test an image with the same context hash is retagged, not rebuilt."""
+        from lokki.cli.deploy import _hash_directory
+
+        build_dir = self._build_dir(tmp_path)
+        ecr = boto3.client("ecr", region_name="us-east-1")
+        ecr.create_repository(repositoryName="flows/lokki")
+        ecr.put_image(
+            repositoryName="flows/lokki",
+            imageManifest=self.MANIFEST,
+            imageTag=f"ctx-{_hash_directory(build_dir / 'lambdas')}",
+        )
+
+        deployer = Deployer(stack_name="test-stack", image_tag="v2")
+        deployer._push_images(self.REPO, build_dir)
+
+        mock_streaming.assert_not_called()
+        images = ecr.describe_images(
+            repositoryName="flows/lokki", imageIds=[{"imageTag": "v2"}]
+        )["imageDetails"]
+        assert len(images) == 1
+
+    @mock_aws
+    @patch("lokki.cli.deploy._run_streaming", return_value=(0, ""))
+    def test_pushed_image_gets_content_tag(
+        self, mock_streaming: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test a freshly pushed image is tagged with its context hash."""
+        build_dir = self._build_dir(tmp_path)
+        ecr = boto3.client("ecr", region_name="us-east-1")
+        ecr.create_repository(repositoryName="flows/lokki")
+
+        deployer = Deployer(stack_name="test-stack", image_tag="v1")
+        deployer._buildx_available = True
+
+        def push(*args: object, **kwargs: object) -> tuple[int, str]:
+            # Stand in for the real push landing in the registry
+            ecr.put_image(
+                repositoryName="flows/lokki",
+                imageManifest=self.MANIFEST,
+                imageTag="v1",
+            )
+            return 0, ""
+
+        mock_streaming.side_effect = push
+        with patch.object(deployer, "_login_to_ecr"):
+            deployer._push_images(self.REPO, build_dir)
+
+        mock_streaming.assert_called_once()
+        tags = ecr.describe_images(repositoryName="flows/lokki")["imageDetails"][0][
+            "imageTags"
+        ]
+        assert "v1" in tags
+        assert any(tag.startswith("ctx-") for tag in tags)
+
+    @mock_aws
+    def test_missing_repository_is_not_an_error(self) -> None:
+        """Test tagging reports False when the repository does not exist."""
+        deployer = Deployer(stack_name="test-stack")
+
+        assert deployer._tag_ecr_image("missing/lokki", "v1", "v2") is False
+
+    def test_unreachable_registry_is_not_an_error(self) -> None:
+        """Test tagging reports False when the registry cannot be reached."""
+        from botocore.exceptions import EndpointConnectionError
+
+        deployer = Deployer(stack_name="test-stack")
+        mock_ecr = MagicMock()
+        mock_ecr.batch_get_image.side_effect = EndpointConnectionError(
+            endpoint_url="https://ecr.example"
+        )
+        deployer.__dict__["ecr_client"] = mock_ecr
+
+        assert deployer._tag_ecr_image("flows/lokki", "v1", "v2") is False
+
+
+class TestHashDirectory:
+    """Tests for build context fingerprinting."""
+
+    def test_hash_tracks_content_and_names(self, tmp_path: Path) -> None:
+        """Test that nested content and renames change the hash."""
+        from lokki.cli.deploy import _hash_directory
+
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("x = 1")
+        (tmp_path / "Dockerfile").write_text("FROM python:3.13")
+        original = _hash_directory(tmp_path)
+
+        assert _hash_directory(tmp_path) == original
+
+        (tmp_path / "pkg" / "mod.py").write_text("x = 2")
+        changed = _hash_directory(tmp_path)
+        assert changed != original
+
+        (tmp_path / "pkg" / "mod.py").rename(tmp_path / "pkg" / "other.py")
+        assert _hash_directory(tmp_path) not in (original, changed)
+
+    def test_hash_ignores_empty_directories(self, tmp_path: Path) -> None:
+        """Test that only files contribute to the hash."""
+        from lokki.cli.deploy import _hash_directory
+
+        (tmp_path / "Dockerfile").write_text("FROM python:3.13")
+        before = _hash_directory(tmp_path)
+        (tmp_path / "empty").mkdir()
+
+        assert _hash_directory(tmp_path) == before
+
+
+class TestDeployerTemplateSource:
+    """Tests for passing large templates through S3."""
+
+    def test_small_template_sent_inline(self) -> None:
+        """Test that templates under the limit are sent as TemplateBody."""
+        deployer = Deployer(stack_name="test-stack")
+
+        with patch.object(deployer, "s3_client") as mock_s3:
+            source = deployer._template_source("{}", "bucket")
+
+        assert source == {"TemplateBody": "{}"}
+        mock_s3.head_object.assert_not_called()
+
+    @mock_aws
+    def test_large_template_uploaded_once(self) -> None:
+        """Test that large templates are uploaded under a content hash."""
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="artifacts")
+        template = "AWSTemplateFormatVersion: '2010-09-09'\n" + "#" * 60_000 + "\n"
+        deployer = Deployer(stack_name="test-stack", region="us-east-1")
+
+        first = deployer._template_source(template, "artifacts")
+        with patch.object(deployer.s3_client, "put_object") as mock_put:
+            second = deployer._template_source(template, "artifacts")
+
+        mock_put.assert_not_called()
+        assert first == second
+        url = first["TemplateURL"]
+        assert url.startswith("https://artifacts.s3.us-east-1.amazonaws.com/")
+        key = url.split(".amazonaws.com/", 1)[1]
+        body = s3.get_object(Bucket="artifacts", Key=key)["Body"].read()
+        assert body.decode() == template
@@ -97,6 +97,77 @@ class TestFlowGraphMapBlock:
         assert isinstance(graph.entries[2], MapCloseEntry)
         assert graph.entries[2].agg_step.name == "aggregate"
 
+    def test_steps_after_aggregation(self) -> None:
+        """Test steps chained after .agg() are resolved, including a second map."""
+
+        @step
+        def get_items() -> list[int]:
+            return [1, 2]
+
+        @step
+        def double(x: int) -> int:
+            return x * 2
+
+        @step
+        def total(results: list[int]) -> int:
+            return sum(results)
+
+        @step
+        def fan_out(x: int) -> list[int]:
+            return [x, x + 1]
+
+        @step
+        def inc(x: int) -> int:
+            return x + 1
+
+        @step
+        def grand_total(results: list[int]) -> int:
+            return sum(results)
+
+        get_items().map(double).agg(total).next(fan_out).map(inc).agg(grand_total)
+
+        graph = FlowGraph(name="test-flow", head=grand_total)
+
+        assert [type(e) for e in graph.entries] == [
+            TaskEntry,
+            MapOpenEntry,
+            MapCloseEntry,
+            TaskEntry,
+            MapOpenEntry,
+            MapCloseEntry,
+        ]
+        assert graph.entries[2].agg_step.name == "total"
+        assert graph.entries[3].node.name == "fan_out"
+        assert graph.entries[4].inner_steps[0].name == "inc"
+        assert graph.entries[5].agg_step.name == "grand_total"
+
+    def test_task_entry_marks_map_source(self) -> None:
+        """Test only the task feeding a map block is marked as its source."""
+
+        @step
+        def get_items() -> list[int]:
+            return [1, 2]
+
+        @step
+        def double(x: int) -> int:
+            return x * 2
+
+        @step
+        def total(results: list[int]) -> int:
+            return sum(results)
+
+        @step
+        def as_list(x: int) -> list[int]:
+            return [x]
+
+        get_items().map(double).agg(total).next(as_list)
+
+        graph = FlowGraph(name="test-flow", head=as_list)
+
+        assert graph.entries[0].is_map_source is True
+        assert graph.entries[3].node.name == "as_list"
+        assert graph.entries[3].is_map_source is False
+
     def test_map_block_with_multiple_inner_steps(self) -> None:
         """Test graph with Map block containing multiple inner steps."""
 
@@ -69,6 +69,22 @@ class TestFlowGraphValidation:
 
             get_data().map([])  # type: ignore
 
+    def test_map_block_without_inner_steps_detected(self) -> None:
+        """Test that resolution reports a map block with no inner steps."""
+        from lokki.decorators import MapBlock
+
+        @step
+        def get_data() -> list[int]:
+            return [1, 2, 3]
+
+        source = get_data()
+        source._map_block = MapBlock(source=source, inner_head=None)  # type: ignore[arg-type]
+
+        with pytest.raises(GraphValidationError) as exc_info:
+            FlowGraph("empty-map", source)
+
+        assert exc_info.value.details == ["Map block 'get_data' has no inner steps"]
+
     def test_graph_with_no_entries(self) -> None:
         """Test that graphs with no entries fail validation."""
         # This is hard to trigger in normal usage, but test the logic
@@ -3,6 +3,8 @@
 import os
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from lokki.runtime.lambdafunction import make_handler
 
 
@@ -198,3 +200,194 @@ class TestMakeHandler:
         call_args = mock_store.write.call_args
         written_data = call_args[0][3]
         assert written_data == "HELLO"
+
+    @patch.dict(
+        os.environ,
+        {"LOKKI_FLOW_NAME": "test-flow", "LOKKI_ARTIFACT_BUCKET": "test-bucket"},
+    )
+    @patch("lokki.runtime.lambdafunction.lambda_handler.S3Store")
+    def test_multiple_inputs_keep_order(self, mock_store_class: MagicMock) -> None:
+        """Test inputs read concurrently are passed in manifest order."""
+        mock_store = MagicMock()
+        mock_store_class.return_value = mock_store
+        mock_store.read.side_effect = lambda url: url.rsplit("/", 1)[-1]
+        mock_store.write.return_value = "s3://test-bucket/test"
+        received: list[list[str]] = []
+
+        def process(input_data: list) -> None:
+            received.append(input_data)
+
+        handler = make_handler(process)
+        urls = [f"s3://bucket/{i}" for i in range(50)]
+        handler({"flow": {"run_id": "test-run", "params": {}}, "input": urls}, None)
+
+        assert received == [[str(i) for i in range(50)]]
+
+    @patch.dict(
+        os.environ,
+        {"LOKKI_FLOW_NAME": "test-flow", "LOKKI_ARTIFACT_BUCKET": "test-bucket"},
+    )
+    @patch("lokki.runtime.lambdafunction.lambda_handler.S3Store")
+    def test_store_reused_across_invocations(self, mock_store_class: MagicMock) -> None:
+        """Test a warm handler builds its store only once."""
+        mock_store_class.return_value.write.return_value = "s3://test-bucket/test"
+
+        handler = make_handler(lambda: "done")
+        event = {"flow": {"run_id": "test-run", "params": {}}, "input": None}
+        handler(event, MagicMock())
+        handler(event, MagicMock())
+
+        mock_store_class.assert_called_once()
+
+    @patch.dict(
+        os.environ,
+        {"LOKKI_FLOW_NAME": "test-flow", "LOKKI_ARTIFACT_BUCKET": "test-bucket"},
+    )
+    @patch("lokki.runtime.lambdafunction.lambda_handler.S3Store")
+    def test_store_built_with_handler(self, mock_store_class: MagicMock) -> None:
+        """Test the store is created when the handler is built, during Init."""
+        make_handler(lambda: "done")
+
+        mock_store_class.assert_called_once()
+
+    @patch.dict(os.environ, {"LOKKI_FLOW_NAME": "test-flow"})
+    @patch("lokki.runtime.lambdafunction.lambda_handler.S3Store")
+    def test_store_error_raised_on_invocation(
+        self, mock_store_class: MagicMock
+    ) -> None:
+        """Test a store that cannot be built fails the invocation, not import."""
+        mock_store_class.side_effect = ValueError("bucket not set")
+
+        handler = make_handler(lambda: "done")
+
+        with pytest.raises(ValueError, match="bucket not set"):
+            handler({"flow": {"run_id": "r", "params": {}}, "input": None}, None)
+
+    @patch.dict(
+        os.environ,
+        {"LOKKI_FLOW_NAME": "test-flow", "LOKKI_ARTIFACT_BUCKET": "test-bucket"},
+    )
+    @patch("lokki.runtime.lambdafunction.lambda_handler.S3Store")
+    def test_signature_inspected_with_handler(
+        self, mock_store_class: MagicMock
+    ) -> None:
+        """Test the step signature is inspected at build time, not per call."""
+        import inspect
+
+        mock_store_class.return_value.write.return_value = "s3://test-bucket/test"
+
+        def my_step(name: str = "world") -> str:
+            return f"hello {name}"
+
+        with patch(
+            "lokki.runtime.runtime.inspect.signature", wraps=inspect.signature
+        ) as mock_signature:
+            handler = make_handler(my_step)
+            mock_signature.assert_called_once_with(my_step)
+            event = {"flow": {"run_id": "r", "params": {"name": "x"}}, "input": None}
+            handler(event, None)
+            handler(event, None)
+
+        mock_signature.assert_called_once_with(my_step)
+
+    @patch.dict(
+        os.environ,
+        {"LOKKI_FLOW_NAME": "test-flow", "LOKKI_ARTIFACT_BUCKET": "test-bucket"},
+    )
+    @patch("lokki.runtime.lambdafunction.lambda_handler.S3Store")
+    def test_flow_name_read_when_handler_built(
+        self, mock_store_class: MagicMock
+    ) -> None:
+        """Test the flow name is resolved once, when the handler is built."""
+        mock_store = mock_store_class.return_value
+        mock_store.write.return_value = "s3://test-bucket/test"
+
+        def my_step() -> str:
+            return "done"
+
+        handler = make_handler(my_step)
+        with patch.dict(os.environ, {"LOKKI_FLOW_NAME": "other-flow"}):
+            handler({"flow": {"run_id": "r", "params": {}}, "input": None}, None)
+
+        assert mock_store.write.call_args.args[:3] == ("test-flow", "r", "my_step")
+
+
+class TestRuntime:
+    def test_signature_inspected_once_per_function(self) -> None:
+        import inspect
+
+        from lokki.runtime.runtime import Runtime
+
+        def my_step(data: int, scale: int = 1) -> int:
+            return data * scale
+
+        with patch(
+            "lokki.runtime.runtime.inspect.signature", wraps=inspect.signature
+        ) as mock_signature:
+            for i in range(3):
+                assert Runtime.call_step(my_step, i, {"scale": 2, "other": 0}) == i * 2
+
+        mock_signature.assert_called_once_with(my_step)
+
+    def test_unhashable_callable_step(self) -> None:
+        from dataclasses import dataclass
+
+        from lokki.runtime.runtime import Runtime
+
+        @dataclass
+        class Scale:
+            factor: int
+
+            def __call__(self, data: int, factor: int = 1) -> int:
+                return data * self.factor * factor
+
+        assert Runtime.call_step(Scale(2), 3, {"factor": 5, "other": 0}) == 30
+
+    def test_kwargs_function_receives_all_params(self) -> None:
+        from lokki.runtime.runtime import Runtime
+
+        def my_step(data: int, **kwargs: int) -> dict[str, int]:
+            return kwargs
+
+        assert Runtime.call_step(my_step, 1, {"a": 1, "b": 2}) == {"a": 1, "b": 2}
+
+    def test_write_items_keeps_order(self) -> None:
+        from lokki.runtime.runtime import Runtime
+
+        store = MagicMock()
+        store.write.side_effect = lambda flow, run, step, item: f"{step}={item}"
+
+        urls = Runtime.write_items(store, "flow", "run", "step", list(range(40)))
+
+        assert urls == [f"step/{i}={i}" for i in range(40)]
+
+
+class TestParseEvent:
+    def test_list_event_takes_flow_from_first_item(self) -> None:
+        from lokki.runtime.lambdafunction.lambda_handler import _parse_event
+
+        event = [{"flow": {"run_id": "r1", "params": {"a": 1}}}, {"flow": "x"}]
+        parsed = _parse_event(event)
+
+        assert parsed.flow.run_id == "r1"
+        assert parsed.flow.params == {"a": 1}
+        assert parsed.input is event
+
+    @pytest.mark.parametrize("event", [[], ["s3://b/0"], [{"flow": "bad"}]])
+    def test_list_event_without_flow_uses_defaults(self, event: list) -> None:
+        from lokki.runtime.lambdafunction.lambda_handler import _parse_event
+
+        parsed = _parse_event(event)
+
+        assert parsed.flow.run_id == "unknown"
+        assert parsed.flow.params == {}
+        assert parsed.input is event
+
+    @pytest.mark.parametrize("event", [{"flow": "bad", "x": 1}, "raw flow input"])
+    def test_other_events_fall_back_to_raw_input(self, event: object) -> None:
+        from lokki.runtime.lambdafunction.lambda_handler import _parse_event
+
+        parsed = _parse_event(event)
+
+        assert parsed.flow.run_id == "unknown"
+        assert parsed.input is event
@@ -2,6 +2,7 @@
 
 import json
 import logging
+from datetime import UTC, datetime
 from io import StringIO
 
 import pytest
@@ -106,6 +107,18 @@ class TestHumanFormatter:
         assert "[INFO]" in output
         assert "Test message" in output
 
+    def test_timestamp_from_record_created(self) -> None:
+        config = LoggingConfig(level="INFO", show_timestamps=True)
+        formatter = HumanFormatter(config)
+        record = logging.makeLogRecord({"msg": "hi", "levelname": "INFO"})
+
+        for created in (1_700_000_000.25, 1_700_000_000.75, 1_700_000_001.0):
+            record.created = created
+            expected = datetime.fromtimestamp(int(created))
+            assert formatter.format(record) == (
+                f"[INFO] {expected:%Y-%m-%d %H:%M:%S} - hi"
+            )
+
 
 class TestJsonFormatter:
     def test_format_basic(self) -> None:
@@ -129,6 +142,32 @@ class TestJsonFormatter:
         assert "ts" in data
         assert data["event"] == "log"
 
+    def test_output_is_compact(self) -> None:
+        formatter = JsonFormatter(LoggingConfig(level="INFO"))
+        record = logging.makeLogRecord(
+            {"msg": "hi", "levelname": "INFO", "step": "s", "total": 3}
+        )
+
+        output = formatter.format(record)
+
+        assert ": " not in output and ", " not in output
+        assert json.loads(output)["total"] == 3
+
+    def test_ts_is_utc_iso_from_record_created(self) -> None:
+        formatter = JsonFormatter(LoggingConfig(level="INFO"))
+        record = logging.makeLogRecord({"msg": "hi", "levelname": "INFO"})
+
+        record.created = 1_700_000_000.5
+        first = json.loads(formatter.format(record))["ts"]
+        record.created = 1_700_000_000.000123
+        second = json.loads(formatter.format(record))["ts"]
+
+        assert first == "2023-11-14T22:13:20.500000Z"
+        assert second.startswith("2023-11-14T22:13:20.0001")
+        assert datetime.fromisoformat(first) == datetime.fromtimestamp(
+            1_700_000_000.5, UTC
+        )
+
     def test_format_with_extra_fields(self) -> None:
         config = LoggingConfig(level="INFO")
         formatter = JsonFormatter(config)
@@ -169,8 +208,20 @@ class TestStepLogger:
         output = handler.stream.getvalue()
         assert "Step 'my_step' started" in output
 
+    def test_uses_slots(self) -> None:
+        step_logger = StepLogger("my_step", logging.getLogger("test"))
+
+        assert not hasattr(step_logger, "__dict__")
+
 
 class TestMapProgressLogger:
+    def test_uses_slots(self) -> None:
+        map_logger = MapProgressLogger(
+            "my_map", 10, logging.getLogger("test"), LoggingConfig()
+        )
+
+        assert not hasattr(map_logger, "__dict__")
+
     def test_progress_updates(self) -> None:
         config = LoggingConfig(level="INFO", progress_interval=1)
         logger = get_logger("test", config)
@@ -208,6 +259,43 @@ class TestMapProgressLogger:
         output = handler.stream.getvalue()
         assert "Map 'my_map' completed" in output
 
+    def test_progress_logged_once_per_interval(self) -> None:
+        config = LoggingConfig(level="INFO", progress_interval=10)
+        logger = get_logger("test", config)
+
+        handler = logging.StreamHandler(StringIO())
+        handler.setFormatter(HumanFormatter(config))
+        logger.handlers = [handler]
+
+        map_logger = MapProgressLogger("my_map", 1000, logger, config)
+        for _ in range(1000):
+            map_logger.update("completed")
+
+        lines = handler.stream.getvalue().splitlines()
+        assert [line.split("(")[-1].split("%")[0] for line in lines] == [
+            str(pct) for pct in range(10, 101, 10)
+        ]
+
+    def test_failed_items_do_not_log_progress(self) -> None:
+        config = LoggingConfig(level="INFO", progress_interval=10)
+        logger = get_logger("test", config)
+
+        handler = logging.StreamHandler(StringIO())
+        handler.setFormatter(HumanFormatter(config))
+        logger.handlers = [handler]
+
+        map_logger = MapProgressLogger("my_map", 10, logger, config)
+        map_logger.update("completed")
+        map_logger.update("failed")
+        map_logger.update("failed")
+
+        assert handler.stream.getvalue().count("1/10 (10%)") == 1
+        assert map_logger.failed == 2
+
+    def test_progress_thresholds_small_map(self) -> None:
+        assert MapProgressLogger._progress_thresholds(3, 10) == {1, 2, 3}
+        assert MapProgressLogger._progress_thresholds(0, 10) == frozenset()
+
 
 class TestGetLogger:
     def test_creates_logger(self) -> None:
@@ -218,6 +306,16 @@ class TestGetLogger:
         assert logger.level == logging.INFO
         assert len(logger.handlers) == 1
 
+    def test_reconfigure_reuses_handler(self) -> None:
+        logger = get_logger("test_reuse", LoggingConfig(level="INFO"))
+        handler = logger.handlers[0]
+
+        logger = get_logger("test_reuse", LoggingConfig(level="DEBUG", format="json"))
+
+        assert logger.handlers == [handler]
+        assert logger.level == logging.DEBUG
+        assert isinstance(handler.formatter, JsonFormatter)
+
     def test_json_format(self) -> None:
         config = LoggingConfig(level="INFO", format="json")
         logger = get_logger("test_json", config)
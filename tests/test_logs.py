@@ -10,8 +10,13 @@ from lokki.cli.logs import (
     LogsError,
     _fetch_and_print_logs,
     _fetch_log_events,
+    _format_timestamp,
     _parse_datetime,
     _print_logs,
+    _run_id_filter_pattern,
+    _tail_log_events,
+    _tail_logs,
+    _TailCursor,
     fetch_logs,
     logs,
 )
@@ -46,20 +51,22 @@ class TestFetchLogs:
     def test_fetch_logs_default_times(self, mock_get_client) -> None:
         mock_logs = MagicMock()
         mock_get_client.return_value = mock_logs
-        mock_logs.filter_log_events.return_value = {"events": []}
+        mock_logs.get_paginator.return_value.paginate.return_value = [{"events": []}]
 
         fetch_logs(
             flow_name="test-flow",
             step_names=["step1", "step2"],
         )
 
-        assert mock_logs.filter_log_events.call_count >= 1
+        mock_logs.get_paginator.assert_called_with("filter_log_events")
+        assert mock_logs.get_paginator.return_value.paginate.call_count == 2
 
     @patch("lokki.cli.logs.get_logs_client")
     def test_fetch_logs_with_run_id(self, mock_get_client) -> None:
         mock_logs = MagicMock()
         mock_get_client.return_value = mock_logs
-        mock_logs.filter_log_events.return_value = {"events": []}
+        paginate = mock_logs.get_paginator.return_value.paginate
+        paginate.return_value = [{"events": []}]
 
         fetch_logs(
             flow_name="test-flow",
@@ -67,17 +74,33 @@ class TestFetchLogs:
             run_id="test-run-123",
         )
 
-        call_kwargs = mock_logs.filter_log_events.call_args[1]
+        call_kwargs = paginate.call_args[1]
         assert "filterPattern" in call_kwargs
         assert "test-run-123" in call_kwargs["filterPattern"]
 
+    @patch("lokki.cli.logs.get_logs_client")
+    def test_fetch_logs_uses_endpoint(self, mock_get_client) -> None:
+        mock_logs = MagicMock()
+        mock_get_client.return_value = mock_logs
+        mock_logs.get_paginator.return_value.paginate.return_value = [{"events": []}]
+
+        fetch_logs(
+            flow_name="test-flow",
+            step_names=["step1"],
+            region="eu-west-1",
+            endpoint="http://localhost:4566",
+        )
+
+        mock_get_client.assert_called_once_with("eu-west-1", "http://localhost:4566")
+
     @patch("lokki.cli.logs.get_logs_client")
     def test_log_group_not_found(self, mock_get_client) -> None:
         from botocore.exceptions import ClientError
 
         mock_logs = MagicMock()
         mock_get_client.return_value = mock_logs
-        mock_logs.filter_log_events.side_effect = ClientError(
+        paginate = mock_logs.get_paginator.return_value.paginate
+        paginate.side_effect = ClientError(
             {"Error": {"Code": "ResourceNotFoundException"}}, "FilterLogEvents"
         )
 
@@ -86,7 +109,7 @@ class TestFetchLogs:
             step_names=["nonexistent-step"],
         )
 
-        mock_logs.filter_log_events.assert_called_once()
+        paginate.assert_called_once()
 
 
 class TestFetchLogEvents:
@@ -94,63 +117,153 @@ class TestFetchLogEvents:
 
     def test_returns_events(self) -> None:
         mock_logs = MagicMock()
-        mock_logs.filter_log_events.return_value = {
-            "events": [
-                {
-                    "timestamp": 1705315800000,
-                    "message": "Test log message",
-                    "logStreamName": "test-flow-step1",
-                }
-            ]
-        }
-
-        events = _fetch_log_events(
-            mock_logs,
-            "/aws/lambda/test-flow-step1",
-            datetime(2024, 1, 15, tzinfo=UTC),
-            datetime(2024, 1, 16, tzinfo=UTC),
-            None,
+        mock_logs.get_paginator.return_value.paginate.return_value = [
+            {
+                "events": [
+                    {
+                        "timestamp": 1705315800000,
+                        "message": "Test log message",
+                        "logStreamName": "test-flow-step1",
+                    }
+                ]
+            }
+        ]
+
+        events = list(
+            _fetch_log_events(
+                mock_logs,
+                "/aws/lambda/test-flow-step1",
+                datetime(2024, 1, 15, tzinfo=UTC),
+                datetime(2024, 1, 16, tzinfo=UTC),
+                None,
+            )
         )
 
         assert len(events) == 1
         assert events[0]["message"] == "Test log message"
 
+    def test_follows_all_pages(self) -> None:
+        mock_logs = MagicMock()
+        paginate = mock_logs.get_paginator.return_value.paginate
+        paginate.return_value = [
+            {"events": [{"timestamp": 1, "message": "a"}], "nextToken": "t1"},
+            {"events": [], "nextToken": "t2"},
+            {"events": [{"timestamp": 2, "message": "b"}]},
+        ]
+
+        events = list(
+            _fetch_log_events(
+                mock_logs,
+                "/aws/lambda/test-flow-step1",
+                datetime(2024, 1, 15, tzinfo=UTC),
+                datetime(2024, 1, 16, tzinfo=UTC),
+                None,
+            )
+        )
+
+        assert [e["message"] for e in events] == ["a", "b"]
+        assert "limit" not in paginate.call_args[1]
+
     def test_handles_missing_log_group(self) -> None:
         from botocore.exceptions import ClientError
 
         mock_logs = MagicMock()
-        mock_logs.filter_log_events.side_effect = ClientError(
+        mock_logs.get_paginator.return_value.paginate.side_effect = ClientError(
             {"Error": {"Code": "ResourceNotFoundException"}}, "FilterLogEvents"
         )
 
-        events = _fetch_log_events(
-            mock_logs,
-            "/aws/lambda/nonexistent",
-            datetime(2024, 1, 15, tzinfo=UTC),
-            datetime(2024, 1, 16, tzinfo=UTC),
-            None,
+        events = list(
+            _fetch_log_events(
+                mock_logs,
+                "/aws/lambda/nonexistent",
+                datetime(2024, 1, 15, tzinfo=UTC),
+                datetime(2024, 1, 16, tzinfo=UTC),
+                None,
+            )
         )
 
         assert events == []
 
 
+class TestRunIdFilterPattern:
+    """Tests for _run_id_filter_pattern function."""
+
+    def test_quotes_run_id(self) -> None:
+        assert _run_id_filter_pattern("run-123:abc") == '"run-123:abc"'
+
+    def test_escapes_quotes_and_backslashes(self) -> None:
+        assert _run_id_filter_pattern('a"b\\c') == '"a\\"b\\\\c"'
+
+
+class TestFormatTimestamp:
+    """Tests for _format_timestamp function."""
+
+    def test_formats_milliseconds_as_utc(self) -> None:
+        assert _format_timestamp(1705315800123) == "2024-01-15T10:50:00.123+00:00"
+
+    def test_pads_whole_seconds(self) -> None:
+        assert _format_timestamp(1705315800000) == "2024-01-15T10:50:00.000+00:00"
+
+
 class TestPrintLogs:
     def test_print_logs_with_events(self):
         mock_logs = MagicMock()
-        mock_logs.filter_log_events.return_value = {
-            "events": [
+        mock_logs.get_paginator.return_value.paginate.return_value = [
+            {
+                "events": [
+                    {
+                        "timestamp": 1705315800000,
+                        "message": "Test log message 1",
+                        "logStreamName": "test-flow-step1",
+                    },
+                    {
+                        "timestamp": 1705315810000,
+                        "message": "Test log message 2",
+                        "logStreamName": "test-flow-step2",
+                    },
+                ]
+            }
+        ]
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            _print_logs(
+                mock_logs,
+                "test-flow",
+                ["step1", "step2"],
+                datetime(2024, 1, 15, tzinfo=UTC),
+                datetime(2024, 1, 16, tzinfo=UTC),
+                None,
+            )
+            output = mock_stdout.getvalue()
+            assert "Test log message 1" in output
+            assert "Test log message 2" in output
+
+    def test_print_logs_merges_groups_in_timestamp_order(self):
+        pages = {
+            "/aws/lambda/test-flow-step1": [
                 {
-                    "timestamp": 1705315800000,
-                    "message": "Test log message 1",
+                    "timestamp": 1000,
+                    "message": "a1",
                     "logStreamName": "test-flow-step1",
                 },
                 {
-                    "timestamp": 1705315810000,
-                    "message": "Test log message 2",
+                    "timestamp": 3000,
+                    "message": "a3",
+                    "logStreamName": "test-flow-step1",
+                },
+            ],
+            "/aws/lambda/test-flow-step2": [
+                {
+                    "timestamp": 2000,
+                    "message": "b2",
                     "logStreamName": "test-flow-step2",
                 },
-            ]
+            ],
         }
+        mock_logs = MagicMock()
+        mock_logs.get_paginator.return_value.paginate.side_effect = lambda **kw: [
+            {"events": pages[kw["logGroupName"]]}
+        ]
 
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
             _print_logs(
@@ -161,13 +274,13 @@ class TestPrintLogs:
                 datetime(2024, 1, 16, tzinfo=UTC),
                 None,
             )
-            output = mock_stdout.getvalue()
-            assert "Test log message 1" in output
-            assert "Test log message 2" in output
+
+        messages = [line.split()[-1] for line in mock_stdout.getvalue().splitlines()]
+        assert messages == ["a1", "b2", "a3"]
 
     def test_print_logs_no_events(self):
         mock_logs = MagicMock()
-        mock_logs.filter_log_events.return_value = {"events": []}
+        mock_logs.get_paginator.return_value.paginate.return_value = [{"events": []}]
 
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
             _print_logs(
@@ -188,6 +301,7 @@ class TestTailLogs:
         mock_logs.filter_log_events.return_value = {
             "events": [
                 {
+                    "eventId": "e1",
                     "timestamp": 1705315800000,
                     "message": "Tailed log message",
                     "logStreamName": "test-flow-step1",
@@ -195,8 +309,6 @@ class TestTailLogs:
             ]
         }
 
-        from lokki.cli.logs import _tail_log_events
-
         events = _tail_log_events(
             mock_logs,
             "/aws/lambda/test-flow-step1",
@@ -207,26 +319,89 @@ class TestTailLogs:
         assert len(events) == 1
         assert events[0]["message"] == "Tailed log message"
 
-    def test_tail_log_events_filters_old(self):
+    def test_tail_log_events_skips_seen_ids(self):
         mock_logs = MagicMock()
         mock_logs.filter_log_events.return_value = {
             "events": [
-                {"timestamp": 1705315800000, "message": "Old message"},
-                {"timestamp": 1705315900000, "message": "New message"},
+                {"eventId": "e1", "timestamp": 1705315850000, "message": "Old"},
+                {"eventId": "e2", "timestamp": 1705315850000, "message": "Late"},
+                {"eventId": "e3", "timestamp": 1705315900000, "message": "New"},
             ]
         }
-
-        from lokki.cli.logs import _tail_log_events
+        cursors = {
+            "/aws/lambda/test-flow-step1": _TailCursor(1705315850000, {"e1"}),
+        }
 
         events = _tail_log_events(
             mock_logs,
             "/aws/lambda/test-flow-step1",
             None,
-            {"/aws/lambda/test-flow-step1": 1705315850000},
+            cursors,
         )
 
-        assert len(events) == 1
-        assert events[0]["message"] == "New message"
+        assert [e["message"] for e in events] == ["Late", "New"]
+        call_kwargs = mock_logs.filter_log_events.call_args[1]
+        assert call_kwargs["startTime"] == 1705315850000
+        cursor = cursors["/aws/lambda/test-flow-step1"]
+        assert cursor.start_time == 1705315900000
+        assert cursor.seen_ids == {"e3"}
+
+    def test_tail_log_events_drains_next_token(self):
+        mock_logs = MagicMock()
+        mock_logs.filter_log_events.side_effect = [
+            {
+                "events": [{"eventId": "e1", "timestamp": 1, "message": "a"}],
+                "nextToken": "t1",
+            },
+            {"events": [], "nextToken": "t2"},
+            {
+                "events": [{"eventId": "e2", "timestamp": 2, "message": "b"}],
+                "nextToken": "t2",
+            },
+        ]
+
+        events = _tail_log_events(mock_logs, "/aws/lambda/g", None, {})
+
+        assert [e["message"] for e in events] == ["a", "b"]
+        assert mock_logs.filter_log_events.call_count == 3
+        last_kwargs = mock_logs.filter_log_events.call_args[1]
+        assert last_kwargs["nextToken"] == "t2"
+
+    @patch("lokki.cli.logs.time.sleep", side_effect=KeyboardInterrupt)
+    def test_tail_logs_merges_groups_each_tick(self, mock_sleep):
+        events = {
+            "/aws/lambda/test-flow-step1": [
+                {
+                    "eventId": "a",
+                    "timestamp": 3000,
+                    "message": "late",
+                    "logStreamName": "s1",
+                },
+            ],
+            "/aws/lambda/test-flow-step2": [
+                {
+                    "eventId": "b",
+                    "timestamp": 1000,
+                    "message": "early",
+                    "logStreamName": "s2",
+                },
+            ],
+        }
+        mock_logs = MagicMock()
+        mock_logs.filter_log_events.side_effect = lambda **kw: {
+            "events": events[kw["logGroupName"]]
+        }
+
+        with (
+            patch("sys.stdout", new_callable=StringIO) as mock_stdout,
+            pytest.raises(KeyboardInterrupt),
+        ):
+            _tail_logs(mock_logs, "test-flow", ["step1", "step2"], None)
+
+        lines = mock_stdout.getvalue().splitlines()[1:]
+        assert lines[0].endswith("[step2] early")
+        assert lines[1].endswith("[step1] late")
+        assert mock_logs.filter_log_events.call_count == 2
 
     def test_tail_log_events_handles_missing_group(self):
         from botocore.exceptions import ClientError
@@ -236,8 +411,6 @@ class TestTailLogs:
             {"Error": {"Code": "ResourceNotFoundException"}}, "FilterLogEvents"
         )
 
-        from lokki.cli.logs import _tail_log_events
-
         events = _tail_log_events(
             mock_logs,
             "/aws/lambda/nonexistent",
@@ -58,6 +58,26 @@ class TestLocalRunner:
         result = runner.run(test_flow())
         assert result == "A,B,C"
 
+    def test_run_agg_keeps_item_order(self) -> None:
+        @step
+        def get_items() -> list[int]:
+            return list(range(50))
+
+        @step
+        def square(x: int) -> int:
+            return x * x
+
+        @step
+        def collect(items: list[int]) -> list[int]:
+            return items
+
+        @flow
+        def test_flow() -> Any:
+            return get_items().map(square).agg(collect)
+
+        runner = LocalRunner()
+        assert runner.run(test_flow()) == [x * x for x in range(50)]
+
     def test_run_map_multiple_inner_steps(self) -> None:
         @step
         def get_items() -> list[int]:
@@ -83,6 +103,214 @@ class TestLocalRunner:
         result = runner.run(test_flow())
         assert result == 18
 
+    def test_run_map_items_do_not_wait_for_each_other(self) -> None:
+        import threading
+
+        fast_item_done = threading.Event()
+
+        @step
+        def get_items() -> list[int]:
+            return [0, 1]
+
+        @step
+        def first(x: int) -> int:
+            # Item 0 only finishes its first step once item 1 has run both
+            if x == 0:
+                assert fast_item_done.wait(timeout=5)
+            return x
+
+        @step
+        def second(x: int) -> int:
+            if x == 1:
+                fast_item_done.set()
+            return x * 10
+
+        @step
+        def collect(items: list[int]) -> list[int]:
+            return items
+
+        @flow
+        def test_flow() -> Any:
+            return get_items().map(first).map(second).agg(collect)
+
+        runner = LocalRunner()
+        result = runner.run(test_flow())
+        assert result == [0, 10]
+
+    def test_run_map_respects_max_workers(self) -> None:
+        import threading
+
+        threads: set[int] = set()
+
+        @step
+        def get_items() -> list[int]:
+            return list(range(8))
+
+        @step
+        def record(x: int) -> int:
+            threads.add(threading.get_ident())
+            return x
+
+        @step
+        def count(items: list[int]) -> int:
+            return len(items)
+
+        @flow
+        def test_flow() -> Any:
+            return get_items().map(record).agg(count)
+
+        runner = LocalRunner(max_workers=1)
+        assert runner.run(test_flow()) == 8
+        assert len(threads) == 1
+
+    def test_max_workers_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("LOKKI_MAP_WORKERS", "3")
+        assert LocalRunner()._get_max_workers() == 3
+        assert LocalRunner(max_workers=5)._get_max_workers() == 5
+
+    def test_max_workers_ignores_invalid_env(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from lokki.runtime.local import _DEFAULT_MAP_WORKERS
+
+        monkeypatch.setenv("LOKKI_MAP_WORKERS", "lots")
+        assert LocalRunner()._get_max_workers() == _DEFAULT_MAP_WORKERS
+
+    def test_run_cleans_up_store_in_background(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import threading
+
+        from lokki.store.local import LocalStore
+
+        monkeypatch.setenv("LOKKI_STORE_TYPE", "local")
+        stores: list[LocalStore] = []
+        cleanup_threads: list[str] = []
+        original_cleanup = LocalStore.cleanup
+
+        def cleanup(store: LocalStore) -> None:
+            stores.append(store)
+            cleanup_threads.append(threading.current_thread().name)
+            original_cleanup(store)
+
+        monkeypatch.setattr(LocalStore, "cleanup", cleanup)
+
+        @step
+        def hello() -> str:
+            return "hello"
+
+        @flow
+        def test_flow() -> Any:
+            return hello()
+
+        runner = LocalRunner()
+        assert runner.run(test_flow()) == "hello"
+        runner.wait_for_cleanup()
+
+        assert cleanup_threads == ["lokki-cleanup"]
+        assert not stores[0].base_dir.exists()
+
+    def test_run_waits_for_previous_cleanup(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import threading
+
+        from lokki.store.local import LocalStore
+
+        monkeypatch.setenv("LOKKI_STORE_TYPE", "local")
+        release = threading.Event()
+        finished: list[LocalStore] = []
+
+        def cleanup(store: LocalStore) -> None:
+            release.wait(timeout=5)
+            finished.append(store)
+
+        monkeypatch.setattr(LocalStore, "cleanup", cleanup)
+
+        @step
+        def hello() -> str:
+            return "hello"
+
+        @flow
+        def test_flow() -> Any:
+            return hello()
+
+        runner = LocalRunner()
+        runner.run(test_flow())
+        assert finished == []
+
+        release.set()
+        runner.run(test_flow())
+        assert len(finished) >= 1
+        runner.wait_for_cleanup()
+        assert len(finished) == 2
+
+    def test_run_logs_failed_cleanup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from unittest.mock import MagicMock
+
+        from lokki.store.local import LocalStore
+
+        monkeypatch.setenv("LOKKI_STORE_TYPE", "local")
+
+        def cleanup(store: LocalStore) -> None:
+            raise OSError("disk gone")
+
+        monkeypatch.setattr(LocalStore, "cleanup", cleanup)
+
+        @step
+        def hello() -> str:
+            return "hello"
+
+        @flow
+        def test_flow() -> Any:
+            return hello()
+
+        runner = LocalRunner()
+        runner.logger = MagicMock()
+        assert runner.run(test_flow()) == "hello"
+        runner.wait_for_cleanup()
+
+        runner.logger.warning.assert_called_once()
+        assert "disk gone" in runner.logger.warning.call_args.args[0]
+
+    def test_list_result_without_map_skips_manifest(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from lokki.store.local import LocalStore
+
+        written: list[str] = []
+        original = LocalStore.write_manifest
+
+        def write_manifest(store: LocalStore, *args: Any) -> str:
+            written.append(args[2])
+            return original(store, *args)
+
+        monkeypatch.setenv("LOKKI_STORE_TYPE", "local")
+        monkeypatch.setattr(LocalStore, "write_manifest", write_manifest)
+
+        @step
+        def get_items() -> list[int]:
+            return [1, 2, 3]
+
+        @step
+        def double(x: int) -> int:
+            return x * 2
+
+        @step
+        def as_pairs(items: list[int]) -> list[list[int]]:
+            return [[x, x] for x in items]
+
+        @step
+        def first(pairs: list[list[int]]) -> list[int]:
+            return pairs[0]
+
+        @flow
+        def test_flow() -> Any:
+            return get_items().map(double).agg(as_pairs).next(first)
+
+        assert LocalRunner().run(test_flow()) == [2, 2]
+        assert written == ["get_items"]
+
     def test_run_map_without_agg(self) -> None:
         """Test running a flow with map but no aggregation (side-effect only)."""
 
@@ -202,6 +430,64 @@ class TestLocalStore:
         result = store.read(str(tmp_path / "flow" / "run1" / "step1" / "output.pkl.gz"))
         assert result == {"key": "value"}
 
+    def test_store_creates_step_dir_once(self, tmp_path: Path) -> None:
+        from unittest.mock import patch
+
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as m:
+            store.write("flow", "run1", "step1", [1, 2])
+            m.reset_mock()
+            store.write_manifest("flow", "run1", "step1", [1, 2])
+            store.write("flow", "run1", "step1", [3])
+
+        m.assert_not_called()
+        assert store.read_cached("flow", "run1", "step1") == [3]
+
+        store.cleanup()
+        store.write("flow", "run1", "step1", [4])
+        assert store.read_cached("flow", "run1", "step1") == [4]
+
+    def test_store_write_is_gzip_pickle(self, tmp_path: Path) -> None:
+        import gzip
+        import pickle
+
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        payload = {"blob": bytes(range(256)) * 1024}
+        location = store.write("flow", "run1", "step1", payload)
+
+        with gzip.open(location, "rb") as f:
+            assert pickle.load(f) == payload
+        assert store.read_cached("flow", "run1", "step1") == payload
+
+    def test_store_write_small_output_uncompressed(self, tmp_path: Path) -> None:
+        import pickle
+
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        location = store.write("flow", "run1", "step1", {"small": 1})
+
+        assert pickle.loads(Path(location).read_bytes()) == {"small": 1}
+        assert LocalStore(tmp_path).read(location) == {"small": 1}
+
+    def test_store_read_returns_independent_copy(self, tmp_path: Path) -> None:
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        obj = {"key": ["value"]}
+        location = store.write("flow", "run1", "step1", obj)
+
+        result = store.read(location)
+        result["key"].append("mutated")
+
+        assert result is not obj
+        assert obj == {"key": ["value"]}
+        assert store.read(location) == {"key": ["value"]}
+
     def test_store_write_manifest(self, tmp_path: Path) -> None:
         from lokki.store.local import LocalStore
 
@@ -213,6 +499,70 @@ class TestLocalStore:
         assert manifest_path.exists()
         assert json.loads(manifest_path.read_text()) == items
 
+    def test_store_write_manifest_dates(self, tmp_path: Path) -> None:
+        from datetime import date, datetime
+
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        items = [{"day": date(2024, 1, 15), "at": (datetime(2024, 1, 15, 10, 30),)}]
+        location = store.write_manifest("flow", "run1", "step1", items)
+
+        assert json.loads(Path(location).read_text()) == [
+            {"day": "2024-01-15", "at": ["2024-01-15T10:30:00"]}
+        ]
+
+    def test_store_files_use_umask_mode(self, tmp_path: Path) -> None:
+        import os
+        import stat
+
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        original = os.umask(0o027)
+        try:
+            output = store.write("flow", "run1", "step1", [1, 2])
+            manifest = store.write_manifest("flow", "run1", "step1", [1, 2])
+            # A umask change after import applies to later writes
+            os.umask(0o022)
+            later = store.write("flow", "run1", "step2", [3])
+        finally:
+            os.umask(original)
+
+        for location in (output, manifest):
+            assert stat.S_IMODE(Path(location).stat().st_mode) == 0o640
+        assert stat.S_IMODE(Path(later).stat().st_mode) == 0o644
+
+    def test_store_write_manifest_skips_identical(self, tmp_path: Path) -> None:
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        location = Path(store.write_manifest("flow", "run1", "step1", [1, 2]))
+        inode = location.stat().st_ino
+
+        store.write_manifest("flow", "run1", "step1", [1, 2])
+        assert location.stat().st_ino == inode
+
+        store.write_manifest("flow", "run1", "step1", [3])
+        assert json.loads(location.read_text()) == [3]
+        assert sorted(p.name for p in location.parent.iterdir()) == [
+            "map_manifest.json"
+        ]
+
+    def test_store_failed_write_keeps_previous_output(self, tmp_path: Path) -> None:
+        import pickle
+
+        from lokki.store.local import LocalStore
+
+        store = LocalStore(tmp_path)
+        location = store.write("flow", "run1", "step1", {"ok": True})
+
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            store.write("flow", "run1", "step1", lambda: None)
+
+        assert LocalStore(tmp_path).read(location) == {"ok": True}
+        assert [p.name for p in Path(location).parent.iterdir()] == ["output.pkl.gz"]
+
 
 class TestRetryLogic:
     def test_retry_on_failure(self) -> None:
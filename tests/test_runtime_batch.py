@@ -124,3 +124,64 @@ class TestMakeBatchHandler:
         assert result["flow"]["run_id"] == "test-run"
         assert "input" in result
         mock_store.write_manifest.assert_called_once()
+
+    @patch.dict(os.environ, {"LOKKI_FLOW_NAME": "test-flow"})
+    @patch("lokki.runtime.batchjob.batch_handler.load_config")
+    @patch("lokki.runtime.batchjob.batch_handler.S3Store")
+    def test_store_reused_across_invocations(
+        self, mock_store_class: MagicMock, mock_config: MagicMock
+    ) -> None:
+        mock_config.return_value.flow_name = "test-flow"
+        mock_store_class.return_value.write.return_value = "s3://test-bucket/test"
+
+        handler = make_batch_handler(lambda input_data: "done")
+        event = {"flow": {"run_id": "test-run", "params": {}}, "input": None}
+        handler(event)
+        handler(event)
+
+        mock_store_class.assert_called_once()
+
+    @patch.dict(os.environ, {"LOKKI_FLOW_NAME": "test-flow"})
+    @patch("lokki.runtime.batchjob.batch_handler.load_config")
+    @patch("lokki.runtime.batchjob.batch_handler.S3Store")
+    def test_config_loaded_once_per_handler(
+        self, mock_store_class: MagicMock, mock_config: MagicMock
+    ) -> None:
+        mock_config.return_value.flow_name = "test-flow"
+        mock_store_class.return_value.write.return_value = "s3://test-bucket/test"
+
+        handler = make_batch_handler(lambda input_data: "done")
+        event = {"flow": {"run_id": "test-run", "params": {}}, "input": None}
+        handler(event)
+        handler(event)
+
+        mock_config.assert_called_once()
+        mock_store_class.return_value.write.assert_called_with(
+            "test-flow", "test-run", "<lambda>", "done"
+        )
+
+    @patch.dict(os.environ, {"LOKKI_FLOW_NAME": "test-flow"})
+    @patch("lokki.runtime.batchjob.batch_handler.load_config")
+    @patch("lokki.runtime.batchjob.batch_handler.S3Store")
+    def test_list_result_written_per_item_only(
+        self, mock_store_class: MagicMock, mock_config: MagicMock
+    ) -> None:
+        mock_config.return_value.flow_name = "test-flow"
+        mock_store = mock_store_class.return_value
+        mock_store.write.side_effect = lambda flow, run, step, item: f"s3://b/{step}"
+        mock_store.write_manifest.return_value = "s3://b/manifest.json"
+
+        def fan_out(input_data) -> list[int]:
+            return [1, 2]
+
+        handler = make_batch_handler(fan_out)
+        result = handler({"flow": {"run_id": "r", "params": {}}, "input": None})
+
+        assert result["input"] == "s3://b/manifest.json"
+        assert sorted(c.args[2] for c in mock_store.write.call_args_list) == [
+            "fan_out/0",
+            "fan_out/1",
+        ]
+        mock_store.write_manifest.assert_called_once_with(
+            "test-flow", "r", "fan_out", ["s3://b/fan_out/0", "s3://b/fan_out/1"]
+        )
@@ -146,3 +146,38 @@ class TestBatchMain:
 
         if "test_module" in sys.modules:
             del sys.modules["test_module"]
+
+    @pytest.mark.parametrize(
+        ("input_data", "expected"),
+        [
+            ('  {"flow": {"run_id": "r"}}', {"flow": {"run_id": "r"}}),
+            ("42", {"input_data": "42"}),
+            ("{not json", {"input_data": "{not json"}),
+        ],
+    )
+    def test_main_input_data_dispatch(self, monkeypatch, input_data, expected):
+        """Test only JSON objects and arrays are decoded as the event."""
+        monkeypatch.setenv("LOKKI_STEP_NAME", "test_step")
+        monkeypatch.setenv("LOKKI_MODULE_NAME", "test_module")
+        monkeypatch.setenv("LOKKI_INPUT_DATA", input_data)
+
+        mock_module = MagicMock()
+        mock_module.test_step = MagicMock(return_value="result")
+        monkeypatch.setitem(sys.modules, "test_module", mock_module)
+
+        events = []
+
+        def handler(event):
+            events.append(event)
+            return {}
+
+        with patch(
+            "lokki.runtime.batchjob.make_batch_handler",
+            return_value=handler,
+            create=True,
+        ):
+            from lokki.runtime.batch_main import main
+
+            main()
+
+        assert events == [expected]
@@ -266,6 +266,15 @@ class TestS3StoreWriteManifest:
 
         assert result == items
 
+    def test_write_manifest_compact_json(self, s3_store, s3_client) -> None:
+        """Test manifest body is compact JSON bytes."""
+        s3_store.write_manifest("flow1", "run1", "map_step", ["s3://b/0", "s3://b/1"])
+
+        key = "lokki/flow1/runs/run1/map_step/map_manifest.json"
+        response = s3_client.get_object(Bucket="test-bucket", Key=key)
+
+        assert response["Body"].read() == b'["s3://b/0","s3://b/1"]'
+
     def test_write_manifest_multiple_steps(self, s3_store, s3_client) -> None:
         """Test write_manifest for multiple map steps."""
         loc1 = s3_store.write_manifest("flow1", "run1", "map1", [{"id": 1}])